@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Run Phase 1 fetch -> merge -> rank in one process, reusing cached stage outputs."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SKILLS = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SKILLS / "rss-fetch" / "scripts"))
+sys.path.insert(0, str(SKILLS / "signal_harvest" / "scripts"))
+sys.path.insert(0, str(SKILLS / "signal_filter_rank" / "scripts"))
+
+import category_classifier  # noqa: E402
+import merge_signals  # noqa: E402
+import novelty_index  # noqa: E402
+import rank  # noqa: E402
+import rss_fetch  # noqa: E402
+from http_pool import ConnectionPool  # noqa: E402
+
+CACHE_VERSION = 1
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Run rss-fetch, merge_signals and rank in one process with stage caching")
+    p.add_argument("--feeds", default="skills/rss-fetch/templates/feeds.txt", help="Path to feeds.txt")
+    p.add_argument("--rss-out-dir", default="skills/rss-fetch/data", help="rss-fetch output directory (items.json, digest.md, errors.json)")
+    p.add_argument("--state-file", default=None, help="rss-fetch state.json (default: <rss-out-dir>/state.json)")
+    p.add_argument("--since-hours", type=int, default=24, help="Only include items newer than N hours")
+    p.add_argument("--max-items-per-feed", type=int, default=20, help="Max items per feed")
+    p.add_argument("--summary-max-chars", type=int, default=800, help="Max summary characters per item")
+    p.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout seconds")
+    p.add_argument("--concurrency", type=int, default=1, help="Max feeds fetched in parallel")
+    p.add_argument("--skip-network-check", action="store_true", help="Skip startup internet connectivity preflight")
+    p.add_argument("--web-signals", default="artifacts/web_signals.json", help="Path to web signals JSON list")
+    p.add_argument("--output", default="artifacts/raw_signals.json", help="Path to merged signals JSON")
+    p.add_argument("--max-signals", type=int, default=12, help="Maximum number of merged signals")
+    p.add_argument("--min-web", type=int, default=4, help="Minimum number of web channel signals to keep (if available)")
+    p.add_argument("--min-rss", type=int, default=4, help="Minimum number of rss channel signals to keep (if available)")
+    p.add_argument(
+        "--quota",
+        action="append",
+        type=merge_signals.parse_quota,
+        default=[],
+        metavar="CHANNEL=MIN[:MAX]",
+        help="Per-channel minimum and optional maximum of kept signals (repeatable; overrides --min-web/--min-rss)",
+    )
+    p.add_argument("--ranked-output", default="artifacts/ranked_signals.json", help="Path to ranked top signals JSON")
+    p.add_argument("--top-k", "--top", dest="top_k", type=int, default=3, help="Number of ranked signals to keep (as rank.py --top-k)")
+    p.add_argument(
+        "--novelty-index",
+        default=None,
+        help="Novelty index to rank against; merged signals are appended to it after ranking",
+    )
+    p.add_argument("--cache-dir", default="artifacts/.pipeline_cache", help="Directory for cached stage outputs")
+    p.add_argument(
+        "--fetch-max-age",
+        type=float,
+        default=60.0,
+        help="Minutes a cached fetch stays reusable when feeds and fetch parameters are unchanged",
+    )
+    p.add_argument("--refresh", action="store_true", help="Refetch feeds even if a fresh cached fetch exists")
+    return p.parse_args(argv)
+
+
+def fingerprint(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def scripts_digest(directory: Path) -> dict[str, str | None]:
+    # Every module in a skill's scripts folder, so an edit to any helper the
+    # stage imports invalidates its cache.
+    return {path.name: file_digest(path) for path in sorted(directory.glob("*.py"))}
+
+
+class StageCache:
+    """One cache slot per stage: ``<cache-dir>/<stage>.json`` holds the fingerprint and output of its last run."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def load(self, stage: str, key: str, max_age_seconds: float | None = None) -> Any | None:
+        path = self.cache_dir / f"{stage}.json"
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return None
+        if entry.get("version") != CACHE_VERSION or entry.get("fingerprint") != key:
+            return None
+        if max_age_seconds is not None and time.time() - float(entry.get("created_at", 0)) > max_age_seconds:
+            return None
+        return entry.get("output")
+
+    def store(self, stage: str, key: str, output: Any) -> None:
+        entry = {"version": CACHE_VERSION, "fingerprint": key, "created_at": time.time(), "output": output}
+        rss_fetch.write_text_atomic(self.cache_dir / f"{stage}.json", json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class Pipeline:
+    """Runs each stage only when its fingerprint (inputs, parameters, stage code) differs from the cached one.
+
+    Downstream fingerprints include the digest of the upstream output, so a
+    refetch that yields identical items still reuses the cached merge and rank.
+    """
+
+    def __init__(self, args: argparse.Namespace, cache: StageCache) -> None:
+        self.args = args
+        self.cache = cache
+        self.report: dict[str, dict[str, Any]] = {}
+
+    def stage(self, name: str, inputs: dict[str, Any], compute: Callable[[], Any], max_age_seconds: float | None = None) -> tuple[Any, bool]:
+        start = time.perf_counter()
+        key = fingerprint({"stage": name, **inputs})
+        output = self.cache.load(name, key, max_age_seconds)
+        cached = output is not None
+        if not cached:
+            output = compute()
+            self.cache.store(name, key, output)
+        self.report[name] = {
+            "status": "cached" if cached else "ran",
+            "fingerprint": key[:16],
+            "seconds": round(time.perf_counter() - start, 6),
+        }
+        return output, cached
+
+    def fetch_inputs(self) -> dict[str, Any]:
+        args = self.args
+        return {
+            "feeds": rss_fetch.read_feeds_file(Path(args.feeds)),
+            "since_hours": args.since_hours,
+            "options": asdict(fetch_options(args)),
+            "code": scripts_digest(Path(rss_fetch.__file__).parent),
+        }
+
+    def run(self) -> dict[str, Any]:
+        args = self.args
+        fetch_inputs = self.fetch_inputs()
+        # --refresh ages out any cached fetch; the new one is stored under the same fingerprint.
+        max_age = -1.0 if args.refresh else args.fetch_max_age * 60
+        fetched, _ = self.stage("fetch", fetch_inputs, lambda: run_fetch(args, fetch_inputs["feeds"]), max_age)
+
+        web_items = merge_signals.load_json_array(Path(args.web_signals))
+        merge_inputs = {
+            "rss": fingerprint(fetched["items"]),
+            "web": fingerprint(web_items),
+            "params": [args.max_signals, args.min_web, args.min_rss, args.quota],
+            "code": [file_digest(Path(merge_signals.__file__)), file_digest(Path(category_classifier.__file__))],
+        }
+        merged, merge_cached = self.stage("merge", merge_inputs, lambda: run_merge(args, web_items, fetched["items"]))
+        write_if_needed(Path(args.output), merged["signals"], merge_cached)
+
+        # With a novelty index the rank fingerprint names the index but not its
+        # contents, so the same merged signals keep their cached ranking after
+        # this run appends them to the index.
+        rank_inputs = {
+            "signals": fingerprint(merged["signals"]),
+            "top": args.top_k,
+            "novelty_index": args.novelty_index,
+            "code": [file_digest(Path(rank.__file__)), file_digest(Path(novelty_index.__file__))],
+        }
+        index = novelty_index.NoveltyIndex(Path(args.novelty_index)) if args.novelty_index else None
+        novelty: dict[str, Any] | None = None
+        try:
+            scorer = rank.Scorer(novelty=index) if index else None
+            ranked, rank_cached = self.stage("rank", rank_inputs, lambda: rank.rank_signals(merged["signals"], args.top_k, scorer))
+            write_if_needed(Path(args.ranked_output), ranked, rank_cached)
+            if index:
+                added = index.add(merged["signals"])
+                novelty = {"added": added, **index.stats()}
+        finally:
+            if index:
+                index.close()
+
+        summary = {
+            "stages": self.report,
+            "rss_items": len(fetched["items"]),
+            "rss_errors": len(fetched["errors"]),
+            "merge": merged["stats"],
+            "ranked": [sig.get("title") for sig in ranked],
+        }
+        if novelty is not None:
+            summary["novelty_index"] = novelty
+        return summary
+
+
+def fetch_options(args: argparse.Namespace) -> rss_fetch.FetchOptions:
+    return rss_fetch.FetchOptions(
+        timeout=args.timeout,
+        concurrency=args.concurrency,
+        max_items_per_feed=args.max_items_per_feed,
+        summary_max_chars=args.summary_max_chars,
+    )
+
+
+def run_fetch(args: argparse.Namespace, feeds: list[str]) -> dict[str, Any]:
+    # Same state, seen store and output files as a standalone rss_fetch.py run.
+    out_dir = Path(args.rss_out_dir)
+    state_path = Path(args.state_file) if args.state_file else out_dir / "state.json"
+    pool = ConnectionPool(timeout=args.timeout)
+    try:
+        if not args.skip_network_check and any(rss_fetch.is_http_url(feed_url) for feed_url in feeds):
+            rss_fetch.preflight_network_check(timeout=args.timeout, user_agent=rss_fetch.DEFAULT_USER_AGENT, pool=pool, feed_urls=feeds)
+        state = rss_fetch.load_state(state_path)
+        store = rss_fetch.open_seen_store("sqlite", state, state_path.with_suffix(".seen.sqlite"))
+        try:
+            fetch_run = rss_fetch.fetch_items(
+                feeds,
+                since=timedelta(hours=args.since_hours),
+                store=store,
+                state=state,
+                options=fetch_options(args),
+                pool=pool,
+            )
+            items = [item.to_dict() for item in fetch_run]
+            errors = [error.to_dict() for error in fetch_run.errors]
+            store.save(state)
+        finally:
+            store.close()
+    finally:
+        pool.close()
+    rss_fetch.write_outputs(out_dir, state_path, state, items, errors)
+    return {"fetched_at": datetime.now(timezone.utc).isoformat(), "items": items, "errors": errors}
+
+
+def run_merge(args: argparse.Namespace, web_items: list[dict], rss_items: list[dict]) -> dict[str, Any]:
+    signals, stats = merge_signals.merge_records(
+        web_items,
+        rss_items,
+        max_signals=args.max_signals,
+        min_web=args.min_web,
+        min_rss=args.min_rss,
+        quotas=args.quota,
+    )
+    return {"signals": signals, "stats": stats}
+
+
+def write_if_needed(path: Path, payload: Any, cached: bool) -> None:
+    # Cached stages leave their output file alone unless it has gone missing.
+    if cached and path.exists():
+        return
+    rss_fetch.write_json(path, payload)
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    if args.since_hours < 0:
+        raise rss_fetch.FeedProcessingError("input", "--since-hours must be >= 0")
+    if args.top_k <= 0:
+        raise rss_fetch.FeedProcessingError("input", "--top-k must be > 0")
+    if args.fetch_max_age < 0:
+        raise rss_fetch.FeedProcessingError("input", "--fetch-max-age must be >= 0")
+    fetch_options(args).validate()
+
+    summary = Pipeline(args, StageCache(Path(args.cache_dir))).run()
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 2 if summary["rss_errors"] else 0
+
+
+def main() -> int:
+    try:
+        return run(sys.argv[1:])
+    except rss_fetch.FeedProcessingError as e:
+        sys.stderr.write(f"{e.stage} error: {e.message}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Offline end-to-end benchmark: synthetic feeds -> rss_fetch -> merge_signals -> rank."""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+SCRIPTS = Path(__file__).resolve().parent
+SKILLS = SCRIPTS.parents[1]
+RSS_FETCH = SCRIPTS / "rss_fetch.py"
+MERGE_SIGNALS = SKILLS / "signal_harvest" / "scripts" / "merge_signals.py"
+RANK = SKILLS / "signal_filter_rank" / "scripts" / "rank.py"
+
+TOPICS = ["agent", "infrastructure", "payments", "security", "regulation", "developer", "cloud", "identity"]
+# Stages slower than baseline by this much absolute time are never flagged (timer noise).
+MIN_REGRESSION_SECONDS = 0.05
+
+
+class SyntheticFeeds:
+    """Deterministic feed set: which feeds fail, redirect or support ETag is fixed by the seed."""
+
+    def __init__(self, feeds: int, entries: int, summary_words: int, seed: int, error_rate: float, redirect_rate: float, etag_rate: float) -> None:
+        rng = random.Random(seed)
+        indices = list(range(feeds))
+        rng.shuffle(indices)
+        n_errors = round(feeds * error_rate)
+        n_redirects = round(feeds * redirect_rate)
+        self.failing = set(indices[:n_errors])
+        self.redirected = set(indices[n_errors : n_errors + n_redirects])
+        self.with_etag = set(rng.sample(range(feeds), round(feeds * etag_rate)))
+        self.count = feeds
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.bodies = [self._render(i, entries, summary_words, now, rng) for i in range(feeds)]
+
+    def _render(self, i: int, entries: int, summary_words: int, now: datetime, rng: random.Random) -> bytes:
+        # Newest-first entries a few minutes apart, like a real feed.
+        rows = []
+        for n in range(entries):
+            topic = rng.choice(TOPICS)
+            when = now - timedelta(minutes=7 * n + i)
+            words = " ".join(rng.choice(TOPICS + ["platform", "launch", "update", "report"]) for _ in range(summary_words))
+            title = f"Feed {i} {topic} story {n}"
+            url = f"https://bench.example/{i}/{n}"
+            if i % 2 == 0:
+                rows.append(
+                    f"<item><guid>bench-{i}-{n}</guid><title>{title}</title><link>{url}</link>"
+                    f"<pubDate>{format_datetime(when, usegmt=True)}</pubDate>"
+                    f"<description><![CDATA[<p>{words}</p>]]></description></item>"
+                )
+            else:
+                rows.append(
+                    f"<entry><id>tag:bench.example,2026:{i}-{n}</id><title>{title}</title><link href=\"{url}\"/>"
+                    f"<updated>{when.isoformat()}</updated><summary type=\"html\">&lt;p&gt;{words}&lt;/p&gt;</summary></entry>"
+                )
+        if i % 2 == 0:
+            doc = f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench RSS {i}</title><link>https://bench.example/{i}</link>{"".join(rows)}</channel></rss>'
+        else:
+            doc = f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Bench Atom {i}</title><link href="https://bench.example/{i}"/>{"".join(rows)}</feed>'
+        return doc.encode("utf-8")
+
+    def urls(self, base: str) -> list[str]:
+        return [f"{base}/{'r' if i in self.redirected else 'feed'}/{i}.xml" for i in range(self.count)]
+
+
+class FeedServer:
+    """Local HTTP stand-in serving SyntheticFeeds with latency, errors, redirects and 304s."""
+
+    def __init__(self, feeds: SyntheticFeeds, latency_ms: float, error_status: int, compress: bool) -> None:
+        self.feeds = feeds
+        # Bodies are gzipped once up front, as a static-file server would cache them.
+        self.gzipped = [gzip.compress(body, compresslevel=6) for body in feeds.bodies] if compress else None
+        self.latency = latency_ms / 1000.0
+        self.error_status = error_status
+        self.counters = {"requests": 0, "ok": 0, "not_modified": 0, "redirects": 0, "errors": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def reset(self) -> dict[str, int]:
+        with self._lock:
+            snapshot = dict(self.counters)
+            self.counters = dict.fromkeys(self.counters, 0)
+        return snapshot
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                server.count("requests")
+                if server.latency:
+                    time.sleep(server.latency)
+                kind, _, name = self.path.strip("/").partition("/")
+                try:
+                    i = int(name.removesuffix(".xml"))
+                    body = server.feeds.bodies[i]
+                except (ValueError, IndexError):
+                    self.reply(404)
+                    return
+                if kind == "r":
+                    server.count("redirects")
+                    self.reply(302, headers={"Location": f"/feed/{i}.xml"})
+                    return
+                if i in server.feeds.failing:
+                    server.count("errors")
+                    self.reply(server.error_status, b"synthetic failure")
+                    return
+                headers = {"Content-Type": "application/rss+xml"}
+                if i in server.feeds.with_etag:
+                    etag = f'"bench-{i}"'
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        server.count("not_modified")
+                        self.reply(304, headers={"ETag": etag})
+                        return
+                if server.gzipped is not None and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    body = server.gzipped[i]
+                    headers["Content-Encoding"] = "gzip"
+                server.count("ok")
+                server.count("bytes", len(body))
+                self.reply(200, body, headers)
+
+        return Handler
+
+    def __enter__(self) -> "FeedServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def timed(cmd: list[str], ok_codes: tuple[int, ...] = (0,)) -> tuple[float, str]:
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode not in ok_codes:
+        raise RuntimeError(f"{Path(cmd[1]).name} exited {proc.returncode}: {proc.stderr.strip()}")
+    return elapsed, proc.stdout
+
+
+def run_pipeline(args: argparse.Namespace, server: FeedServer, work_dir: Path) -> list[dict[str, Any]]:
+    feeds_file = work_dir / "feeds.txt"
+    feeds_file.write_text("\n".join(server.feeds.urls(server.base_url)) + "\n", encoding="utf-8")
+    out_dir = work_dir / "rss"
+    fetch_cmd = [
+        sys.executable,
+        str(RSS_FETCH),
+        "--feeds",
+        str(feeds_file),
+        "--out-dir",
+        str(out_dir),
+        "--max-items-per-feed",
+        str(args.entries),
+        "--concurrency",
+        str(args.concurrency),
+        "--skip-network-check",
+        *args.fetch_arg,
+    ]
+
+    results = []
+    server.reset()
+    # Cold: empty state, every entry is new. Warm: same feeds again, so ETag
+    # feeds answer 304 and the rest are parsed and fully deduped.
+    for stage in ("rss_fetch_cold", "rss_fetch_warm"):
+        seconds, stdout = timed(fetch_cmd, ok_codes=(0, 2))
+        summary = json.loads(stdout)
+        results.append(
+            {
+                "stage": stage,
+                "seconds": seconds,
+                "new_items": summary["new_items"],
+                "errors": summary["errors"],
+                "server": server.reset(),
+            }
+        )
+        if stage == "rss_fetch_cold":
+            (work_dir / "cold_items.json").write_bytes((out_dir / "items.json").read_bytes())
+
+    raw_signals = work_dir / "raw_signals.json"
+    merge_cmd = [
+        sys.executable,
+        str(MERGE_SIGNALS),
+        "--web-signals",
+        str(work_dir / "no_web_signals.json"),
+        "--rss-items",
+        str(work_dir / "cold_items.json"),
+        "--output",
+        str(raw_signals),
+        "--max-signals",
+        str(args.max_signals),
+        "--min-web",
+        "0",
+    ]
+    seconds, stdout = timed(merge_cmd)
+    results.append({"stage": "merge_signals", "seconds": seconds, **json.loads(stdout)})
+
+    seconds, _ = timed([sys.executable, str(RANK), "--input", str(raw_signals)])
+    results.append({"stage": "rank", "seconds": seconds, "signals": args.max_signals})
+    return results
+
+
+def best_results(runs: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    # Keep the fastest repetition of each stage (same rule as microbench.best_of).
+    best: dict[str, dict[str, Any]] = {}
+    for run in runs:
+        for row in run:
+            if row["stage"] not in best or row["seconds"] < best[row["stage"]]["seconds"]:
+                best[row["stage"]] = row
+    rows = [best[row["stage"]] for row in runs[0]]
+    for row in rows:
+        row["seconds"] = round(row["seconds"], 4)
+    return rows
+
+
+def compare(results: list[dict[str, Any]], baseline: dict[str, Any], tolerance: float) -> list[dict[str, Any]]:
+    base = {row["stage"]: row["seconds"] for row in baseline.get("results", [])}
+    rows = []
+    for row in results:
+        if row["stage"] not in base:
+            continue
+        before, after = base[row["stage"]], row["seconds"]
+        ratio = after / before if before else None
+        regressed = ratio is not None and ratio > 1 + tolerance and after - before > MIN_REGRESSION_SECONDS
+        rows.append({"stage": row["stage"], "baseline_seconds": before, "seconds": after, "ratio": round(ratio, 3) if ratio else None, "regressed": regressed})
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the offline end-to-end rss-fetch pipeline benchmark")
+    parser.add_argument("--feeds", type=int, default=50, help="Number of synthetic feeds (even: RSS, odd: Atom)")
+    parser.add_argument("--entries", type=int, default=20, help="Entries per feed (also --max-items-per-feed)")
+    parser.add_argument("--summary-words", type=int, default=60, help="Words per entry summary")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Server-side delay added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Fraction of feeds that always fail")
+    parser.add_argument("--error-status", type=int, default=404, help="HTTP status returned by failing feeds")
+    parser.add_argument("--redirect-rate", type=float, default=0.1, help="Fraction of feeds reached through a 302")
+    parser.add_argument("--etag-rate", type=float, default=0.5, help="Fraction of feeds that send an ETag and answer 304")
+    parser.add_argument("--gzip", action="store_true", help="Serve gzip-compressed bodies to clients that accept them")
+    parser.add_argument("--concurrency", type=int, default=8, help="rss_fetch.py --concurrency")
+    parser.add_argument("--max-signals", type=int, default=12, help="merge_signals.py --max-signals")
+    parser.add_argument("--fetch-arg", action="append", default=[], help="Extra argument passed to rss_fetch.py (repeatable)")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for feed content and failure/redirect/ETag assignment")
+    parser.add_argument("--repeat", type=int, default=3, help="Pipeline repetitions (fastest per stage is reported)")
+    parser.add_argument("--out", default=None, help="Write results JSON here (also printed to stdout)")
+    parser.add_argument("--baseline", default=None, help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. baseline before a stage counts as regressed")
+    args = parser.parse_args()
+    for name in ("error_rate", "redirect_rate", "etag_rate"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+    if args.error_rate + args.redirect_rate > 1:
+        parser.error("--error-rate + --redirect-rate must be <= 1")
+    if min(args.feeds, args.entries, args.repeat, args.concurrency) <= 0:
+        parser.error("--feeds, --entries, --repeat and --concurrency must be > 0")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    feeds = SyntheticFeeds(args.feeds, args.entries, args.summary_words, args.seed, args.error_rate, args.redirect_rate, args.etag_rate)
+    config = {k: v for k, v in vars(args).items() if k not in {"out", "baseline"}}
+
+    runs = []
+    with FeedServer(feeds, args.latency_ms, args.error_status, args.gzip) as server:
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix="rss-bench-") as tmp:
+                runs.append(run_pipeline(args, server, Path(tmp)))
+
+    report: dict[str, Any] = {
+        "benchmark": "e2e",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "feed_bytes": sum(len(body) for body in feeds.bodies),
+        "results": best_results(runs),
+    }
+    regressed = False
+    if args.baseline:
+        report["comparison"] = compare(report["results"], json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        regressed = any(row["regressed"] for row in report["comparison"])
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 2 if regressed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
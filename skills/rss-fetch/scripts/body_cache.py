@@ -0,0 +1,85 @@
+"""Size-bounded on-disk store of feed bodies keyed by their sha256, with LRU eviction."""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+BODY_SUFFIX = ".body"
+
+
+class BodyCache:
+    """Content-addressed bodies under ``<dir>/<sha256>.body``.
+
+    File mtimes carry recency across runs: a read or write touches the file,
+    and when the total size exceeds ``max_bytes`` the least recently used
+    bodies are deleted first. Only the thread consuming fetch outcomes uses it.
+    """
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        entries = []
+        for body_path in path.glob(f"*{BODY_SUFFIX}"):
+            stat = body_path.stat()
+            entries.append((stat.st_mtime, body_path.stem, stat.st_size))
+        self._sizes: OrderedDict[str, int] = OrderedDict((digest, size) for _, digest, size in sorted(entries))
+        self._bytes = sum(self._sizes.values())
+
+    def _file(self, digest: str) -> Path:
+        return self.path / f"{digest}{BODY_SUFFIX}"
+
+    def get(self, digest: str) -> bytes | None:
+        if digest not in self._sizes:
+            self.misses += 1
+            return None
+        try:
+            data = self._file(digest).read_bytes()
+        except OSError:
+            self._forget(digest)
+            self.misses += 1
+            return None
+        os.utime(self._file(digest))
+        self._sizes.move_to_end(digest)
+        self.hits += 1
+        return data
+
+    def put(self, digest: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        if digest in self._sizes:
+            os.utime(self._file(digest))
+            self._sizes.move_to_end(digest)
+            return
+        tmp_path = self.path / f".{digest}.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._file(digest))
+        self._sizes[digest] = len(data)
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._sizes))
+            self.discard(oldest)
+            self.evictions += 1
+
+    def discard(self, digest: str) -> None:
+        if digest in self._sizes:
+            self._file(digest).unlink(missing_ok=True)
+            self._forget(digest)
+
+    def _forget(self, digest: str) -> None:
+        self._bytes -= self._sizes.pop(digest, 0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._sizes),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from json_records import iter_records
+
 
 DEFAULT_FEEDS = "skills/rss-fetch/templates/feeds.txt"
 DEFAULT_QUARANTINE = "skills/rss-fetch/templates/feeds.quarantine.txt"
@@ -87,7 +89,8 @@ def main() -> int:
     active_feeds = read_feed_list(feeds_path)
     quarantine_feeds = read_feed_list(quarantine_path)
 
-    errors = load_json(errors_path, [])
+    # errors.json is a JSON array, or NDJSON (empty when no feed failed).
+    errors = list(iter_records(errors_path))
     rss_state = load_json(state_path, {"feeds": {}})
     health_state = load_json(health_state_path, {"version": 1, "feeds": {}})
 
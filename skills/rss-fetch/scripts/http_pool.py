@@ -0,0 +1,260 @@
+"""Per-host keep-alive HTTP connection pool with a run-scoped DNS cache."""
+
+from __future__ import annotations
+
+import http.client
+import socket
+import ssl
+import threading
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlparse
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 4
+DRAIN_LIMIT = 64 * 1024
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Errors that mean an idle keep-alive socket was closed by the server while parked.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+HostKey = tuple[str, str, int]
+
+
+class _PooledHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, pool: "ConnectionPool", host: str, port: int, timeout: float) -> None:
+        super().__init__(host, port, timeout=timeout)
+        self._pool = pool
+
+    def connect(self) -> None:
+        self.sock = self._pool.create_socket(self.host, self.port, self.timeout)
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, pool: "ConnectionPool", host: str, port: int, timeout: float, context: ssl.SSLContext) -> None:
+        super().__init__(host, port, timeout=timeout, context=context)
+        self._pool = pool
+        self._ssl_context = context
+
+    def connect(self) -> None:
+        sock = self._pool.create_socket(self.host, self.port, self.timeout)
+        self.sock = self._ssl_context.wrap_socket(sock, server_hostname=self.host)
+
+
+class PooledResponse:
+    """Response wrapper that returns its connection to the pool once fully read."""
+
+    def __init__(self, pool: "ConnectionPool", key: HostKey, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse, url: str) -> None:
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self._released = False
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._resp.read(amt)
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        reusable = self._resp.isclosed() and not self._resp.will_close
+        if not reusable:
+            self._resp.close()
+        self._pool.release(self._key, self._conn, reusable=reusable)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Reuse HTTP(S) connections per host, cache DNS, and cap per-host concurrency.
+
+    Requests through an environment-configured proxy bypass the pool and use
+    ``urlopen`` so proxy handling stays identical to the stdlib.
+    """
+
+    def __init__(self, timeout: float, per_host_limit: int = 2) -> None:
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._idle: dict[HostKey, list[http.client.HTTPConnection]] = {}
+        self._host_slots: dict[HostKey, threading.BoundedSemaphore] = {}
+        self._dns: dict[tuple[str, int], list[tuple[Any, ...]]] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._proxies = getproxies()
+        self._stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "dns_lookups": 0,
+            "dns_cache_hits": 0,
+            "unpooled_requests": 0,
+        }
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def resolve(self, host: str, port: int) -> list[tuple[Any, ...]]:
+        with self._lock:
+            cached = self._dns.get((host, port))
+            if cached is not None:
+                self._stats["dns_cache_hits"] += 1
+                return cached
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            self._stats["dns_lookups"] += 1
+            self._dns[(host, port)] = infos
+        return infos
+
+    def create_socket(self, host: str, port: int, timeout: float) -> socket.socket:
+        last_error: OSError | None = None
+        for family, socktype, proto, _canonname, sockaddr in self.resolve(host, port):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(sockaddr)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return sock
+            except OSError as e:
+                last_error = e
+                sock.close()
+        raise last_error or OSError(f"getaddrinfo returned no addresses for {host}")
+
+    def _host_key(self, url: str) -> HostKey:
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname or ""
+        if not host:
+            raise ValueError(f"URL has no host: {url}")
+        port = parsed.port or (443 if scheme == "https" else 80)
+        return scheme, host, port
+
+    def _slot(self, key: HostKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[key] = slot
+            return slot
+
+    def _checkout(self, key: HostKey) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._stats["connections_reused"] += 1
+                return idle.pop(), True
+            self._stats["connections_opened"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return _PooledHTTPSConnection(self, host, port, self.timeout, self._ssl_context), False
+        return _PooledHTTPConnection(self, host, port, self.timeout), False
+
+    def release(self, key: HostKey, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        try:
+            if reusable and conn.sock is not None:
+                with self._lock:
+                    idle = self._idle.setdefault(key, [])
+                    if len(idle) < MAX_IDLE_PER_HOST:
+                        idle.append(conn)
+                        return
+            conn.close()
+        finally:
+            self._slot(key).release()
+
+    def _uses_proxy(self, url: str) -> bool:
+        parsed = urlparse(url)
+        return parsed.scheme.lower() in self._proxies and not proxy_bypass(parsed.hostname or "")
+
+    def _send(self, key: HostKey, url: str, headers: dict[str, str]) -> PooledResponse:
+        parsed = urlparse(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+
+        slot = self._slot(key)
+        slot.acquire()
+        conn, reused = self._checkout(key)
+        try:
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # The server dropped a parked connection; retry once on a fresh one.
+                conn.close()
+                conn, _ = self._checkout_fresh(key)
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+        except BaseException:
+            conn.close()
+            slot.release()
+            raise
+        return PooledResponse(self, key, conn, resp, url)
+
+    def _checkout_fresh(self, key: HostKey) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            for conn in self._idle.pop(key, []):
+                conn.close()
+        return self._checkout(key)
+
+    def open(self, url: str, headers: dict[str, str]) -> Any:
+        self._count("requests")
+        if self._uses_proxy(url):
+            self._count("unpooled_requests")
+            return urlopen(Request(url, headers=headers), timeout=self.timeout)
+
+        for _ in range(MAX_REDIRECTS + 1):
+            key = self._host_key(url)
+            resp = self._send(key, url, headers)
+            if 200 <= resp.status < 300:
+                return resp
+
+            location = resp.headers.get("Location")
+            # Drain small bodies so the connection can go back to the pool; larger
+            # ones leave the response unfinished and the connection is dropped.
+            resp.read(DRAIN_LIMIT)
+            resp.close()
+            if resp.status in REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+
+        raise HTTPError(url, resp.status, f"Too many redirects (>{MAX_REDIRECTS})", resp.headers, None)
+
+    def warm(self, url: str) -> None:
+        # Open a connection without sending a request and park it for the first real fetch.
+        key = self._host_key(url)
+        with self._lock:
+            if self._idle.get(key):
+                return
+        slot = self._slot(key)
+        slot.acquire()
+        conn, _ = self._checkout(key)
+        try:
+            conn.connect()
+        except BaseException:
+            conn.close()
+            slot.release()
+            raise
+        self.release(key, conn, reusable=True)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,45 @@
+"""Readers for record files in either layout rss_fetch.py writes: a JSON array or NDJSON."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+
+def iter_stream_records(stream: TextIO, name: str = "input") -> Iterator[dict[str, Any]]:
+    # A JSON array is loaded whole; NDJSON is read line by line, never loaded
+    # whole. Empty or whitespace-only input (an NDJSON run with no records)
+    # holds no records. Entries that are not objects are skipped. The stream is
+    # never seeked, so stdin works.
+    first = stream.read(1)
+    while first.isspace():
+        first = stream.read(1)
+    if not first:
+        return
+    if first == "[":
+        yield from (x for x in json.loads(first + stream.read()) if isinstance(x, dict))
+        return
+    if first != "{":
+        raise ValueError(f"Expected a JSON array or NDJSON objects in {name}")
+    line_no = 1
+    pending = first + stream.readline()
+    while pending:
+        if pending.strip():
+            try:
+                record = json.loads(pending)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid NDJSON at {name}:{line_no}: {e}") from e
+            if isinstance(record, dict):
+                yield record
+        line_no += 1
+        pending = stream.readline()
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    # A missing file holds no records.
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as f:
+        yield from iter_stream_records(f, str(path))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for rss-fetch parsing hot paths (offline, stdlib only)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "tests" / "fixtures"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import rss_fetch  # noqa: E402
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_rss(items: int) -> bytes:
+    body = "".join(
+        f"<item><guid>guid-{i}</guid><title>Synthetic item {i}</title>"
+        f"<link>https://example.com/posts/{i}</link>"
+        f"<pubDate>Fri, 13 Feb 2026 10:{i % 60:02d}:00 GMT</pubDate>"
+        f"<category>bench</category><dc:creator>Bench</dc:creator>"
+        f"<description><![CDATA[<p>Summary for <b>item {i}</b> with some words.</p>]]></description></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f"<channel><title>Synthetic RSS</title><link>https://example.com</link>{body}</channel></rss>"
+    ).encode("utf-8")
+
+
+def synthetic_atom(entries: int) -> bytes:
+    body = "".join(
+        f"<entry><id>tag:example.com,2026:{i}</id><title>Synthetic entry {i}</title>"
+        f'<link rel="self" href="https://example.com/api/{i}"/><link href="https://example.com/posts/{i}"/>'
+        f"<author><name>Bench</name></author><updated>2026-02-13T10:{i % 60:02d}:00Z</updated>"
+        f'<content type="html">&lt;p&gt;Content for entry {i}.&lt;/p&gt;</content></entry>'
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        f'<title>Synthetic Atom</title><link href="https://example.com/"/>{body}</feed>'
+    ).encode("utf-8")
+
+
+# Reference implementation of the per-field subtree walks used before the
+# single-pass extractor, kept here only as the benchmark baseline.
+def legacy_first_text(elem: ET.Element, names: list[str]) -> str | None:
+    wanted = set(names)
+    for child in elem.iter():
+        if rss_fetch.local_name(child.tag) in wanted:
+            text = (child.text or "").strip()
+            if text:
+                return text
+    return None
+
+
+def legacy_rss_entry(item: ET.Element) -> dict[str, str | None]:
+    return {
+        "guid": legacy_first_text(item, ["guid"]),
+        "title": legacy_first_text(item, ["title"]),
+        "url": legacy_first_text(item, ["link"]),
+        "published_raw": legacy_first_text(item, ["pubDate", "published", "updated"]),
+        "summary_raw": legacy_first_text(item, ["description", "summary", "content"]),
+    }
+
+
+def legacy_atom_entry(entry: ET.Element) -> dict[str, str | None]:
+    link = None
+    for link_node in entry.iter():
+        if rss_fetch.local_name(link_node.tag) != "link":
+            continue
+        href = (link_node.attrib.get("href") or "").strip()
+        rel = (link_node.attrib.get("rel") or "alternate").strip().lower()
+        if href and rel == "alternate":
+            link = href
+            break
+        if href and link is None:
+            link = href
+    return {
+        "guid": legacy_first_text(entry, ["id"]),
+        "title": legacy_first_text(entry, ["title"]),
+        "url": link,
+        "published_raw": legacy_first_text(entry, ["published", "updated"]),
+        "summary_raw": legacy_first_text(entry, ["summary", "content"]),
+    }
+
+
+class LegacyHTMLToText(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def handle_data(self, data: str) -> None:
+        if data:
+            self.chunks.append(data)
+
+
+def legacy_html_to_text(value: str, limit: int | None) -> str:
+    parser = LegacyHTMLToText()
+    parser.feed(value)
+    txt = re.sub(r"\s+", " ", " ".join(parser.chunks)).strip()
+    if limit is not None and len(txt) > limit:
+        return txt[: limit - 1].rstrip() + "..."
+    return txt
+
+
+def legacy_summary(value: str, limit: int) -> tuple[str, int]:
+    # Previous normalize_item(): an unbounded pass for word_count plus a bounded pass for summary.
+    full = legacy_html_to_text(value, None)
+    return legacy_html_to_text(value, limit), len(re.findall(r"\b\w+\b", full))
+
+
+def synthetic_content_html(paragraphs: int) -> str:
+    return "".join(
+        f'<p>Paragraph {i} of a long <a href="https://example.com/{i}">full-content</a> post &amp; '
+        f"<em>inline markup</em>, code like <code>x = {i}</code>, and enough prose to be realistic.</p>\n"
+        for i in range(paragraphs)
+    )
+
+
+def summary_cases() -> list[tuple[str, str]]:
+    plain = " ".join(f"Plain text sentence number {i} without any markup." for i in range(200))
+    return [
+        ("plain_text_10kb", plain),
+        ("content_encoded_20kb", synthetic_content_html(120)),
+        ("content_encoded_200kb", synthetic_content_html(1200)),
+    ]
+
+
+def bench_summary(name: str, value: str, limit: int, repeat: int) -> dict[str, Any]:
+    if legacy_summary(value, limit) != rss_fetch.summarize_html(value, limit):
+        raise AssertionError(f"{name}: summarize_html disagrees with legacy two-pass summary")
+
+    legacy_s = best_of(lambda: legacy_summary(value, limit), repeat)
+    current_s = best_of(lambda: rss_fetch.summarize_html(value, limit), repeat)
+    return {
+        "bench": "summary",
+        "case": name,
+        "chars": len(value),
+        "legacy_ms": round(legacy_s * 1000, 3),
+        "single_pass_ms": round(current_s * 1000, 3),
+        "speedup": round(legacy_s / current_s, 2) if current_s else None,
+    }
+
+
+def bench_extract(name: str, xml_bytes: bytes, repeat: int) -> dict[str, Any]:
+    root = ET.fromstring(xml_bytes)
+    if rss_fetch.local_name(root.tag) == "rss":
+        channel = next(c for c in root if rss_fetch.local_name(c.tag) == "channel")
+        entries = [c for c in channel if rss_fetch.local_name(c.tag) == "item"]
+        legacy, current = legacy_rss_entry, rss_fetch.rss_entry
+    else:
+        entries = [c for c in root if rss_fetch.local_name(c.tag) == "entry"]
+        legacy, current = legacy_atom_entry, rss_fetch.atom_entry
+
+    if [legacy(e) for e in entries] != [current(e) for e in entries]:
+        raise AssertionError(f"{name}: single-pass extractor disagrees with legacy walks")
+
+    legacy_s = best_of(lambda: [legacy(e) for e in entries], repeat)
+    current_s = best_of(lambda: [current(e) for e in entries], repeat)
+    parse_s = best_of(lambda: rss_fetch.parse_feed(xml_bytes, name), repeat)
+    return {
+        "bench": "extract",
+        "case": name,
+        "entries": len(entries),
+        "legacy_ms": round(legacy_s * 1000, 3),
+        "single_pass_ms": round(current_s * 1000, 3),
+        "speedup": round(legacy_s / current_s, 2) if current_s else None,
+        "parse_feed_ms": round(parse_s * 1000, 3),
+    }
+
+
+def extract_cases() -> list[tuple[str, bytes]]:
+    cases = [(path.name, path.read_bytes()) for path in sorted(FIXTURES.glob("*.xml"))]
+    cases.append(("synthetic_rss_1000", synthetic_rss(1000)))
+    cases.append(("synthetic_atom_1000", synthetic_atom(1000)))
+    return cases
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run rss-fetch micro-benchmarks")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions per case (best time is reported)")
+    parser.add_argument("--only", choices=["extract", "summary"], default=None, help="Run a single benchmark group")
+    parser.add_argument("--summary-max-chars", type=int, default=800, help="Summary limit used by the summary benchmark")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results: list[dict[str, Any]] = []
+    if args.only in (None, "extract"):
+        results.extend(bench_extract(name, data, args.repeat) for name, data in extract_cases())
+    if args.only in (None, "summary"):
+        results.extend(bench_summary(name, value, args.summary_max_chars, args.repeat) for name, value in summary_cases())
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
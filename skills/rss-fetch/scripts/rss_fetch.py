@@ -5,13 +5,23 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import heapq
+import http.client
 import json
+import multiprocessing
 import os
 import re
-import socket
+import signal
+import sqlite3
+import statistics
 import sys
+import threading
 import time
-from dataclasses import dataclass
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from html.parser import HTMLParser
@@ -22,11 +32,76 @@ from urllib.parse import unquote, urlparse
 from urllib.request import Request, urlopen
 import xml.etree.ElementTree as ET
 
+from body_cache import BodyCache
+from http_pool import ConnectionPool
+from json_records import iter_records
+from run_index import INDEX_NAME, RunIndex, run_id_for
+from run_metrics import RunMetrics, prometheus_text
+from seen_store import JsonSeenStore, SeenStore, SqliteSeenStore
+
 MAX_BYTES = 2 * 1024 * 1024
 RETRIES = 3
 BACKOFF_BASE_SECONDS = 0.5
+RETRY_AFTER_CODES = {429, 503}
+# Retry-After values above this are not waited for; the feed fails for this run.
+MAX_RETRY_AFTER_SECONDS = 60.0
+DEFAULT_BREAKER_THRESHOLD = 3
+FETCH_ERRORS = (URLError, OSError, ValueError, http.client.HTTPException)
 DEFAULT_USER_AGENT = "rss-fetch/1.0 (+local-skill)"
 NETWORK_CHECK_URL = "https://example.com/"
+PREFLIGHT_HOSTS = 3
+PARSE_CHUNK_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 8192
+ACCEPT_ENCODING = "gzip, deflate"
+# Consecutive too-old or already-seen entries after which a feed stops streaming
+# (feeds are assumed newest-first).
+STALE_STREAK_LIMIT = 3
+# An unchanged body (same sha256 as the last parse) is skipped only while that
+# parse is younger than this, so the sqlite seen store still refreshes the
+# last_seen of a quiet feed's IDs at least daily.
+BODY_DIGEST_MAX_AGE_SECONDS = 86400.0
+DEFAULT_BODY_CACHE_MB = 64.0
+# Parse jobs allowed in flight (or finished but not yet yielded) per parse worker.
+PARSE_BACKLOG_PER_WORKER = 2
+# Watch mode: growth factors for the poll interval after an idle poll and after
+# a failed one, and the longest single sleep (keeps SIGTERM handling prompt).
+WATCH_IDLE_BACKOFF = 1.5
+WATCH_ERROR_BACKOFF = 2.0
+WATCH_MAX_SLEEP_SECONDS = 60.0
+# Feeds due within this many seconds of each other are polled in the same tick.
+WATCH_COALESCE_SECONDS = 5.0
+# Most recent publish times used to estimate a feed's cadence.
+CADENCE_SAMPLE = 10
+DIGEST_HEADER = "# Feed Digest\n\n"
+DIGEST_EMPTY = "No new items.\n"
+SY_PERIOD_SECONDS = {"hourly": 3600, "daily": 86400, "weekly": 604800, "monthly": 2592000, "yearly": 31536000}
+WORD_RE = re.compile(r"\b\w+\b")
+WHITESPACE_RE = re.compile(r"\s+")
+
+ENTRY_KEYS = ("guid", "title", "url", "published_raw", "summary_raw")
+# Local element name -> raw entry key; several names may feed one key.
+RSS_ENTRY_FIELDS = {
+    "guid": "guid",
+    "title": "title",
+    "link": "url",
+    "pubDate": "published_raw",
+    "published": "published_raw",
+    "updated": "published_raw",
+    "description": "summary_raw",
+    "summary": "summary_raw",
+    "content": "summary_raw",
+}
+# Feed-level polling hints: RSS <ttl> (minutes) and the syndication module's
+# sy:updatePeriod / sy:updateFrequency.
+FEED_HINT_FIELDS = {"ttl": "ttl", "updatePeriod": "update_period", "updateFrequency": "update_frequency"}
+ATOM_ENTRY_FIELDS = {
+    "id": "guid",
+    "title": "title",
+    "published": "published_raw",
+    "updated": "published_raw",
+    "summary": "summary_raw",
+    "content": "summary_raw",
+}
 
 
 @dataclass
@@ -36,6 +111,148 @@ class FeedErrorRecord:
     error: str
     attempts: int
     status_code: int
+    timestamp: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class FeedSource:
+    feed_url: str
+    site: str | None = None
+    title: str | None = None
+
+
+@dataclass
+class FeedItem:
+    # Typed form of one items.json record; to_dict() returns that exact schema.
+    id: str
+    title: str
+    url: str
+    published_at: str | None
+    summary: str
+    word_count: int
+    source: FeedSource
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "FeedItem":
+        return cls(**{**item, "source": FeedSource(**item["source"])})
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class FetchOptions:
+    timeout: float = 10.0
+    concurrency: int = 1
+    max_items_per_feed: int = 20
+    summary_max_chars: int = 800
+    user_agent: str = DEFAULT_USER_AGENT
+    # 0 parses in the consuming thread; N > 0 uses a pool of N processes.
+    parse_workers: int = 0
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "FetchOptions":
+        return cls(
+            timeout=args.timeout,
+            concurrency=args.concurrency,
+            max_items_per_feed=args.max_items_per_feed,
+            summary_max_chars=args.summary_max_chars,
+            parse_workers=args.parse_workers,
+        )
+
+    def validate(self) -> None:
+        for name in ("timeout", "concurrency", "max_items_per_feed", "summary_max_chars"):
+            if getattr(self, name) <= 0:
+                raise FeedProcessingError("input", f"{name} must be > 0")
+        if self.parse_workers < 0:
+            raise FeedProcessingError("input", "parse_workers must be >= 0")
+
+
+@dataclass
+class FetchFailure:
+    message: str
+    status_code: int = 0
+    retryable: bool = True
+    retry_after: float | None = None
+    connection_error: bool = False
+
+
+@dataclass
+class FetchOutcome:
+    feed_url: str
+    data: bytes = b""
+    status_code: int = 0
+    attempts: int = 0
+    etag: str | None = None
+    last_modified: str | None = None
+    error: Exception | None = None
+    # Time spent inside fetch attempts, and wall time from the first attempt to
+    # the final outcome (includes retry waits).
+    fetch_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    # Bytes received before Content-Encoding decoding (equals len(data) when uncompressed).
+    wire_bytes: int = 0
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+
+@dataclass
+class FeedSelection:
+    items: list[dict[str, Any]]
+    feed_meta: dict[str, str | None]
+    # Publish times of every streamed entry (kept or not), newest-first as served.
+    published: list[datetime] = field(default_factory=list)
+    entries_parsed: int = 0
+    too_old: int = 0
+    deduped: int = 0
+    # True when the per-feed cap stopped streaming with entries left unread.
+    capped: bool = False
+    parse_seconds: float = 0.0
+    normalize_seconds: float = 0.0
+
+
+@dataclass
+class ParsedEntries:
+    # Worker-side parse of one body: every entry up to the furthest point a
+    # sequential select_new_items() could reach, normalized without seen-ID
+    # checks (the seen store stays in the parent process).
+    feed_meta: dict[str, str | None]
+    # (item_id, published, item, normalize_error) in feed order; item_id is None
+    # for entries older than the cutoff.
+    entries: list[tuple[str | None, datetime | None, dict[str, Any] | None, str | None]]
+    capped: bool = False
+    # (stage, message) of an error raised while reading past the last entry.
+    error: tuple[str, str] | None = None
+    parse_seconds: float = 0.0
+    normalize_seconds: float = 0.0
+
+
+@dataclass
+class ParseJob:
+    # Body feed_result() will parse (None: finishes without parsing), the
+    # pending worker parse of it, and any error raised while choosing the body,
+    # which feed_result() re-raises as that feed's error.
+    body: tuple[bytes, str] | None
+    future: Future[ParsedEntries] | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class FeedResult:
+    feed_url: str
+    items: list[dict[str, Any]] = field(default_factory=list)
+    error: dict[str, Any] | None = None
+    not_modified: bool = False
+    selection: FeedSelection | None = None
+    metrics: dict[str, Any] = field(default_factory=dict)
+    # "unchanged" when a 200 body matched the last parsed digest (parse skipped),
+    # "changed" when it was parsed, None for errors and 304s.
+    body_digest: str | None = None
 
 
 class FeedProcessingError(Exception):
@@ -48,16 +265,37 @@ class FeedProcessingError(Exception):
 
 
 class _HTMLToText(HTMLParser):
-    def __init__(self) -> None:
+    # Collects text only until the collapsed prefix exceeds ``limit`` (enough to
+    # build the truncated summary) but counts words across the whole document.
+    def __init__(self, limit: int | None) -> None:
         super().__init__()
         self._chunks: list[str] = []
+        self._limit = limit
+        self._collected = 0
+        self._next_check = limit or 0
+        self._prefix: str | None = None
+        self.words = 0
 
     def handle_data(self, data: str) -> None:
-        if data:
-            self._chunks.append(data)
+        if not data:
+            return
+        self.words += len(WORD_RE.findall(data))
+        if self._prefix is not None:
+            return
+        self._chunks.append(data)
+        self._collected += len(data)
+        if self._limit is not None and self._collected > self._next_check:
+            collapsed = WHITESPACE_RE.sub(" ", " ".join(self._chunks)).strip()
+            if len(collapsed) > self._limit:
+                self._prefix = collapsed
+            else:
+                # Re-check after doubling so whitespace-heavy input stays linear.
+                self._next_check = self._collected * 2
 
     def text(self) -> str:
-        return " ".join(self._chunks)
+        if self._prefix is not None:
+            return self._prefix
+        return WHITESPACE_RE.sub(" ", " ".join(self._chunks)).strip()
 
 
 def now_iso() -> str:
@@ -70,48 +308,36 @@ def local_name(tag: str) -> str:
     return tag
 
 
-def first_text(elem: ET.Element | None, names: list[str]) -> str | None:
-    if elem is None:
-        return None
-    wanted = set(names)
-    for child in elem.iter():
-        if local_name(child.tag) in wanted:
-            text = (child.text or "").strip()
-            if text:
-                return text
-    return None
-
-
-def first_attr(elem: ET.Element | None, element_name: str, attr_name: str) -> str | None:
-    if elem is None:
-        return None
-    for child in elem.iter():
-        if local_name(child.tag) == element_name:
-            val = (child.attrib.get(attr_name) or "").strip()
-            if val:
-                return val
-    return None
+def html_to_text(value: str | None, limit: int | None = 300) -> str:
+    return summarize_html(value, limit)[0]
 
 
-def html_to_text(value: str | None, limit: int | None = 300) -> str:
+def summarize_html(value: str | None, limit: int | None) -> tuple[str, int]:
+    # Returns (summary truncated to limit, word count of the full text) in one pass.
     if not value:
-        return ""
-    parser = _HTMLToText()
-    parser.feed(value)
-    txt = parser.text()
-    txt = re.sub(r"\s+", " ", txt).strip()
-    if limit is not None and len(txt) > limit:
-        return txt[: limit - 1].rstrip() + "..."
-    return txt
+        return "", 0
+    if "<" not in value and "&" not in value:
+        # No markup or entities: the parser would hand back the text unchanged.
+        text = WHITESPACE_RE.sub(" ", value).strip()
+        words = len(WORD_RE.findall(value))
+    else:
+        parser = _HTMLToText(limit)
+        parser.feed(value)
+        parser.close()
+        text = parser.text()
+        words = parser.words
+    if limit is not None and len(text) > limit:
+        return text[: limit - 1].rstrip() + "...", words
+    return text, words
 
 
 def word_count(text: str) -> int:
     if not text:
         return 0
-    return len(re.findall(r"\b\w+\b", text))
+    return len(WORD_RE.findall(text))
 
 
-def parse_date_to_iso(value: str | None) -> str | None:
+def parse_published(value: str | None) -> datetime | None:
     if not value:
         return None
     raw = value.strip()
@@ -122,7 +348,7 @@ def parse_date_to_iso(value: str | None) -> str | None:
         dt = parsedate_to_datetime(raw)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).isoformat()
+        return dt.astimezone(timezone.utc)
     except (TypeError, ValueError):
         pass
 
@@ -131,11 +357,16 @@ def parse_date_to_iso(value: str | None) -> str | None:
         dt = datetime.fromisoformat(iso_candidate)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).isoformat()
+        return dt.astimezone(timezone.utc)
     except ValueError:
         return None
 
 
+def parse_date_to_iso(value: str | None) -> str | None:
+    dt = parse_published(value)
+    return dt.isoformat() if dt else None
+
+
 def read_feeds_file(path: Path) -> list[str]:
     if not path.exists():
         raise FeedProcessingError("input", f"Feeds file not found: {path}")
@@ -153,6 +384,23 @@ def read_feeds_file(path: Path) -> list[str]:
     return feeds
 
 
+def parse_shard(value: str) -> tuple[int, int]:
+    index, sep, count = value.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = (0, 0)
+    if not sep or shard[1] <= 0 or not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError(f"expected i/N with 1 <= i <= N, got {value!r}")
+    return shard
+
+
+def shard_of(feed_url: str, count: int) -> int:
+    # 1-based. sha256 (not hash()) keeps the assignment identical on every
+    # machine and interpreter, so each worker picks its feeds independently.
+    return int.from_bytes(hashlib.sha256(feed_url.encode("utf-8")).digest()[:8], "big") % count + 1
+
+
 def is_http_url(value: str) -> bool:
     scheme = urlparse(value).scheme.lower()
     return scheme in {"http", "https"}
@@ -166,45 +414,302 @@ def resolve_local_path(feed_url: str) -> Path:
     return Path(feed_url).expanduser().resolve()
 
 
-def fetch_feed_bytes(feed_url: str, timeout: float, user_agent: str) -> tuple[bytes, int, int]:
-    last_error: Exception | None = None
-    last_status = 0
+def fetch_attempt(
+    feed_url: str,
+    timeout: float,
+    user_agent: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    pool: ConnectionPool | None = None,
+    attempt: int = 1,
+) -> FetchOutcome:
+    headers = {
+        "User-Agent": user_agent,
+        "Accept": "application/atom+xml, application/rss+xml, application/xml, text/xml;q=0.9, */*;q=0.1",
+        "Accept-Encoding": ACCEPT_ENCODING,
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    if not is_http_url(feed_url):
+        path = resolve_local_path(feed_url)
+        with path.open("rb") as f:
+            data = read_limited(f, MAX_BYTES)
+        return FetchOutcome(feed_url=feed_url, data=data, status_code=200, attempts=attempt, wire_bytes=len(data))
+
+    try:
+        if pool is not None:
+            opened = pool.open(feed_url, headers)
+        else:
+            opened = urlopen(Request(feed_url, headers=headers), timeout=timeout)
+        with opened as resp:
+            status = int(getattr(resp, "status", 200) or 200)
+            data, wire_bytes = read_decoded(resp, MAX_BYTES, resp.headers.get("Content-Encoding"))
+            return FetchOutcome(
+                feed_url=feed_url,
+                data=data,
+                status_code=status,
+                attempts=attempt,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                wire_bytes=wire_bytes,
+            )
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        # Servers may omit validators on 304; keep the ones we sent.
+        return FetchOutcome(
+            feed_url=feed_url,
+            status_code=304,
+            attempts=attempt,
+            etag=e.headers.get("ETag") or etag,
+            last_modified=e.headers.get("Last-Modified") or last_modified,
+        )
 
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    raw = value.strip()
+    if raw.isdigit():
+        return float(raw)
+    try:
+        when = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_fetch_error(e: Exception) -> FetchFailure:
+    message = f"{type(e).__name__}: {e}"
+    if isinstance(e, HTTPError):
+        code = e.code or 0
+        if code in RETRY_AFTER_CODES:
+            delay = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+            if delay is not None and delay > MAX_RETRY_AFTER_SECONDS:
+                return FetchFailure(message, status_code=code, retryable=False)
+            return FetchFailure(message, status_code=code, retry_after=delay)
+        return FetchFailure(message, status_code=code, retryable=not 400 <= code < 500)
+    if isinstance(e, (URLError, OSError, http.client.HTTPException)):
+        return FetchFailure(message, connection_error=True)
+    return FetchFailure(message)
+
+
+def retry_delay(attempt: int, failure: FetchFailure) -> float:
+    if failure.retry_after is not None:
+        return failure.retry_after
+    return BACKOFF_BASE_SECONDS * (2 ** (attempt - 1))
+
+
+def fetch_feed_bytes(
+    feed_url: str,
+    timeout: float,
+    user_agent: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    pool: ConnectionPool | None = None,
+) -> FetchOutcome:
+    # Blocking retry loop for direct callers; run() uses the non-blocking queue in
+    # iter_fetch_outcomes() instead.
+    failure = FetchFailure("unknown fetch error")
+    attempt = 1
     for attempt in range(1, RETRIES + 1):
         try:
-            if is_http_url(feed_url):
-                req = Request(
-                    feed_url,
-                    headers={
-                        "User-Agent": user_agent,
-                        "Accept": "application/atom+xml, application/rss+xml, application/xml, text/xml;q=0.9, */*;q=0.1",
-                    },
-                )
-                with urlopen(req, timeout=timeout) as resp:
-                    status = int(getattr(resp, "status", 200) or 200)
-                    data = read_limited(resp, MAX_BYTES)
-                    return data, status, attempt
-
-            path = resolve_local_path(feed_url)
-            with path.open("rb") as f:
-                data = read_limited(f, MAX_BYTES)
-            return data, 200, attempt
-        except HTTPError as e:
-            last_error = e
-            last_status = e.code or 0
-            if 400 <= (e.code or 0) < 500:
-                break
-        except (URLError, OSError, ValueError, socket.timeout) as e:
-            last_error = e
+            return fetch_attempt(feed_url, timeout, user_agent, etag, last_modified, pool, attempt)
+        except FETCH_ERRORS as e:
+            failure = classify_fetch_error(e)
+        if not failure.retryable or attempt == RETRIES:
+            break
+        time.sleep(retry_delay(attempt, failure))
+
+    raise FeedProcessingError("fetch", failure.message, attempts=attempt, status_code=failure.status_code)
+
+
+def feed_host(feed_url: str) -> str | None:
+    if not is_http_url(feed_url):
+        return None
+    parsed = urlparse(feed_url)
+    host = (parsed.hostname or "").lower()
+    if not host:
+        return None
+    return f"{host}:{parsed.port}" if parsed.port else host
+
+
+class HostCircuitBreaker:
+    # Counts consecutive connection failures per host; any HTTP response resets
+    # the count. Once a host reaches the threshold its remaining fetches fail
+    # fast for the rest of the run. Seeds (prior consecutive failures) are capped
+    # at threshold - 1, so a chronically failing host still gets one probe.
+    def __init__(self, threshold: int, seeds: dict[str, int] | None = None) -> None:
+        self.threshold = threshold
+        self._failures = {host: min(count, threshold - 1) for host, count in (seeds or {}).items()}
+
+    def is_open(self, host: str | None) -> bool:
+        return host is not None and self._failures.get(host, 0) >= self.threshold
+
+    def record(self, host: str | None, reachable: bool) -> None:
+        if host is None:
+            return
+        if reachable:
+            self._failures[host] = 0
+        else:
+            self._failures[host] = self._failures.get(host, 0) + 1
+
+    def open_hosts(self) -> list[str]:
+        return sorted(host for host, count in self._failures.items() if count >= self.threshold)
 
-        if attempt < RETRIES:
-            time.sleep(BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
 
-    msg = f"{type(last_error).__name__}: {last_error}" if last_error else "unknown fetch error"
-    raise FeedProcessingError("fetch", msg, attempts=RETRIES, status_code=last_status)
+def load_breaker_seeds(health_path: Path | None, feeds: list[str]) -> dict[str, int]:
+    # A host is seeded with the smallest consecutive-failure count among its
+    # feeds in feed_health.py's state, so one healthy feed keeps the host unseeded.
+    if health_path is None or not health_path.exists():
+        return {}
+    try:
+        data = json.loads(health_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    health = data.get("feeds") if isinstance(data, dict) else None
+    if not isinstance(health, dict):
+        return {}
+
+    seeds: dict[str, int] = {}
+    for feed_url in feeds:
+        host = feed_host(feed_url)
+        if host is None:
+            continue
+        meta = health.get(feed_url)
+        failures = int(meta.get("consecutive_failures", 0) or 0) if isinstance(meta, dict) else 0
+        seeds[host] = min(seeds.get(host, failures), failures)
+    return {host: count for host, count in seeds.items() if count > 0}
+
+
+def iter_fetch_outcomes(
+    feeds: list[str],
+    timeout: float,
+    user_agent: str,
+    concurrency: int = 1,
+    validators: dict[str, tuple[str | None, str | None]] | None = None,
+    pool: ConnectionPool | None = None,
+    breaker: HostCircuitBreaker | None = None,
+) -> Iterator[FetchOutcome]:
+    # Fetch attempts run in worker threads. A failed attempt is re-queued on a
+    # timer heap (backoff or Retry-After) instead of sleeping, so other feeds keep
+    # going. Outcomes are still yielded in feed order, so parsing, dedupe, and
+    # output ordering match a sequential run.
+    validators = validators or {}
+    breaker = breaker or HostCircuitBreaker(DEFAULT_BREAKER_THRESHOLD)
+    hosts = [feed_host(feed_url) for feed_url in feeds]
+    first_attempts = deque(range(len(feeds)))
+    retries: list[tuple[float, int, int]] = []
+    failures: dict[int, FetchFailure] = {}
+    results: dict[int, FetchOutcome] = {}
+    started: dict[int, float] = {}
+    spent: dict[int, float] = {}
+    next_index = 0
+
+    def attempt_fetch(index: int, attempt: int) -> FetchOutcome:
+        etag, last_modified = validators.get(feeds[index], (None, None))
+        start = time.perf_counter()
+        try:
+            return fetch_attempt(feeds[index], timeout, user_agent, etag, last_modified, pool, attempt)
+        finally:
+            # At most one attempt per feed is in flight, so this never races.
+            spent[index] = spent.get(index, 0.0) + time.perf_counter() - start
+
+    def finish(index: int, outcome: FetchOutcome) -> None:
+        outcome.fetch_seconds = spent.pop(index, 0.0)
+        outcome.elapsed_seconds = time.monotonic() - started.pop(index, time.monotonic())
+        results[index] = outcome
+
+    def give_up(index: int, attempt: int, failure: FetchFailure) -> None:
+        error = FeedProcessingError("fetch", failure.message, attempts=attempt, status_code=failure.status_code)
+        finish(index, FetchOutcome(feed_url=feeds[index], attempts=attempt, error=error))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(feeds))), thread_name_prefix="rss-fetch") as executor:
+        in_flight: dict[Future[FetchOutcome], tuple[int, int]] = {}
+        while next_index < len(feeds):
+            if next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+                continue
 
+            now = time.monotonic()
+            while len(in_flight) < concurrency:
+                if retries and retries[0][0] <= now:
+                    _, index, attempt = heapq.heappop(retries)
+                elif first_attempts:
+                    index, attempt = first_attempts.popleft(), 1
+                else:
+                    break
+                host = hosts[index]
+                if breaker.is_open(host):
+                    if index in failures:
+                        give_up(index, attempt - 1, failures[index])
+                    else:
+                        message = f"Circuit open for host {host} after repeated connection failures"
+                        give_up(index, 0, FetchFailure(message))
+                    continue
+                started.setdefault(index, time.monotonic())
+                in_flight[executor.submit(attempt_fetch, index, attempt)] = (index, attempt)
+
+            if not in_flight:
+                if retries and next_index not in results:
+                    time.sleep(max(0.0, retries[0][0] - time.monotonic()))
+                continue
+
+            wait_for = max(0.0, retries[0][0] - now) if retries else None
+            done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, attempt = in_flight.pop(future)
+                host = hosts[index]
+                error = future.exception()
+                if error is None:
+                    breaker.record(host, reachable=True)
+                    finish(index, future.result())
+                    continue
+                if not isinstance(error, FETCH_ERRORS):
+                    # FeedProcessingError (e.g. max bytes) and unexpected errors are final.
+                    finish(index, FetchOutcome(feed_url=feeds[index], attempts=attempt, error=error))
+                    continue
+
+                failure = classify_fetch_error(error)
+                breaker.record(host, reachable=not failure.connection_error)
+                failures[index] = failure
+                if failure.retryable and attempt < RETRIES and not breaker.is_open(host):
+                    heapq.heappush(retries, (time.monotonic() + retry_delay(attempt, failure), index, attempt + 1))
+                else:
+                    give_up(index, attempt, failure)
+
+
+def conditional_validators(state: dict[str, Any]) -> dict[str, tuple[str | None, str | None]]:
+    validators: dict[str, tuple[str | None, str | None]] = {}
+    for feed_url, meta in state.get("feeds", {}).items():
+        if isinstance(meta, dict) and (meta.get("etag") or meta.get("last_modified")):
+            validators[feed_url] = (meta.get("etag"), meta.get("last_modified"))
+    return validators
+
+
+def preflight_network_check(
+    timeout: float,
+    user_agent: str,
+    target_url: str = NETWORK_CHECK_URL,
+    pool: ConnectionPool | None = None,
+    feed_urls: list[str] | None = None,
+) -> None:
+    if pool is not None:
+        # Warm pooled connections to real feed hosts first; any success proves
+        # connectivity and the parked connection serves that host's first fetch.
+        for url in distinct_host_urls(feed_urls or [], PREFLIGHT_HOSTS):
+            try:
+                pool.warm(url)
+                return
+            except (OSError, ValueError, http.client.HTTPException):
+                continue
 
-def preflight_network_check(timeout: float, user_agent: str, target_url: str = NETWORK_CHECK_URL) -> None:
     req = Request(target_url, headers={"User-Agent": user_agent, "Accept": "*/*"})
     try:
         with urlopen(req, timeout=max(3.0, min(timeout, 5.0))) as _resp:
@@ -220,11 +725,27 @@ def preflight_network_check(timeout: float, user_agent: str, target_url: str = N
         ) from e
 
 
+def distinct_host_urls(feed_urls: list[str], limit: int) -> list[str]:
+    picked: list[str] = []
+    hosts: set[str] = set()
+    for url in feed_urls:
+        if not is_http_url(url):
+            continue
+        host = urlparse(url).netloc.lower()
+        if host in hosts:
+            continue
+        hosts.add(host)
+        picked.append(url)
+        if len(picked) >= limit:
+            break
+    return picked
+
+
 def read_limited(stream: Any, max_bytes: int) -> bytes:
     chunks: list[bytes] = []
     total = 0
     while True:
-        chunk = stream.read(8192)
+        chunk = stream.read(READ_CHUNK_BYTES)
         if not chunk:
             break
         total += len(chunk)
@@ -234,77 +755,175 @@ def read_limited(stream: Any, max_bytes: int) -> bytes:
     return b"".join(chunks)
 
 
+def read_decoded(stream: Any, max_bytes: int, content_encoding: str | None) -> tuple[bytes, int]:
+    # Returns (decoded body, bytes on the wire). max_bytes caps the decoded
+    # output: each compressed chunk is inflated at most up to the remaining
+    # budget, so a decompression bomb fails after max_bytes + 1 bytes of output.
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        data = read_limited(stream, max_bytes)
+        return data, len(data)
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        raise FeedProcessingError("fetch", f"Unsupported Content-Encoding: {encoding}")
+
+    decoder: Any = None
+    chunks: list[bytes] = []
+    total = 0
+    wire_bytes = 0
+    try:
+        while True:
+            chunk = stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            wire_bytes += len(chunk)
+            if wire_bytes > max_bytes:
+                raise FeedProcessingError("fetch", f"Feed exceeded max bytes ({max_bytes})")
+            while chunk:
+                if decoder is not None and decoder.eof:
+                    if encoding == "deflate":
+                        # Drain trailing bytes so a pooled connection can be reused.
+                        break
+                    # A gzip body may hold several members (RFC 1952); each one
+                    # is decoded in turn. Zero padding between members is
+                    # skipped, as gzip.decompress() does.
+                    chunk = chunk.lstrip(b"\x00")
+                    if not chunk:
+                        break
+                    decoder = None
+                if decoder is None:
+                    decoder = zlib.decompressobj(deflate_wbits(chunk) if encoding == "deflate" else 16 + zlib.MAX_WBITS)
+                out = decoder.decompress(chunk, max_bytes - total + 1)
+                total += len(out)
+                if total > max_bytes:
+                    raise FeedProcessingError("fetch", f"Feed exceeded max bytes ({max_bytes}) after decompression")
+                chunks.append(out)
+                chunk = decoder.unused_data if decoder.eof else decoder.unconsumed_tail
+        if decoder is not None and not decoder.eof:
+            tail = decoder.flush()
+            total += len(tail)
+            if total > max_bytes:
+                raise FeedProcessingError("fetch", f"Feed exceeded max bytes ({max_bytes}) after decompression")
+            chunks.append(tail)
+    except zlib.error as e:
+        raise FeedProcessingError("fetch", f"Invalid {encoding} response body: {e}") from e
+    if decoder is not None and not decoder.eof:
+        raise FeedProcessingError("fetch", f"Truncated {encoding} response body")
+    return b"".join(chunks), wire_bytes
+
+
+def deflate_wbits(first_chunk: bytes) -> int:
+    # "deflate" should be zlib-wrapped (RFC 9110), but some servers send a raw
+    # deflate stream; a zlib header is CMF=8 (deflate) with a checksum over two bytes.
+    if len(first_chunk) >= 2 and first_chunk[0] & 0x0F == 8 and (first_chunk[0] << 8 | first_chunk[1]) % 31 == 0:
+        return zlib.MAX_WBITS
+    return -zlib.MAX_WBITS
+
+
 def parse_feed(xml_bytes: bytes, feed_url: str) -> tuple[dict[str, str | None], list[dict[str, str | None]]]:
+    feed_meta: dict[str, str | None] = {"feed_url": feed_url, "site": None, "title": None}
+    entries = list(iter_feed_entries(xml_bytes, feed_meta))
+    return feed_meta, entries
+
+
+def iter_feed_entries(xml_bytes: bytes, feed_meta: dict[str, str | None]) -> Iterator[dict[str, str | None]]:
+    # Incremental parse: entries are yielded as their end tag arrives and then
+    # dropped from the tree, so a caller that stops iterating never pays for the
+    # rest of the document. feed_meta is filled in place from feed-level fields.
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: list[ET.Element] = []
+    root_kind: str | None = None
+    container: ET.Element | None = None
+
     try:
-        root = ET.fromstring(xml_bytes)
+        for offset in range(0, max(len(xml_bytes), 1), PARSE_CHUNK_BYTES):
+            parser.feed(xml_bytes[offset : offset + PARSE_CHUNK_BYTES])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    if len(stack) == 1:
+                        root_kind = local_name(elem.tag)
+                        if root_kind not in {"rss", "feed"}:
+                            raise FeedProcessingError("parse", f"Unsupported feed root element: {root_kind}")
+                        if root_kind == "feed":
+                            container = elem
+                    elif len(stack) == 2 and root_kind == "rss" and container is None and local_name(elem.tag) == "channel":
+                        container = elem
+                    continue
+
+                stack.pop()
+                if container is None or not stack or stack[-1] is not container:
+                    continue
+
+                name = local_name(elem.tag)
+                if name in {"item", "entry"}:
+                    entry = rss_entry(elem) if root_kind == "rss" else atom_entry(elem)
+                    container.remove(elem)
+                    yield entry
+                elif name == "title" and feed_meta.get("title") is None:
+                    feed_meta["title"] = (elem.text or "").strip() or None
+                elif name == "link" and feed_meta.get("site") is None:
+                    if root_kind == "rss":
+                        feed_meta["site"] = (elem.text or "").strip() or None
+                    else:
+                        feed_meta["site"] = (elem.attrib.get("href") or "").strip() or None
+                elif name in FEED_HINT_FIELDS:
+                    feed_meta[FEED_HINT_FIELDS[name]] = (elem.text or "").strip() or None
+        parser.close()
     except ET.ParseError as e:
         raise FeedProcessingError("parse", f"XML parse error: {e}") from e
 
-    root_kind = local_name(root.tag)
-    if root_kind == "rss":
-        return parse_rss(root, feed_url)
-    if root_kind == "feed":
-        return parse_atom(root, feed_url)
-    raise FeedProcessingError("parse", f"Unsupported feed root element: {root_kind}")
+    if root_kind == "rss" and container is None:
+        raise FeedProcessingError("parse", "RSS channel element missing")
 
 
-def parse_rss(root: ET.Element, feed_url: str) -> tuple[dict[str, str | None], list[dict[str, str | None]]]:
-    channel = next((c for c in root if local_name(c.tag) == "channel"), None)
-    if channel is None:
-        raise FeedProcessingError("parse", "RSS channel element missing")
+def rss_entry(item: ET.Element) -> dict[str, str | None]:
+    return extract_entry_fields(item, RSS_ENTRY_FIELDS)
 
-    feed_title = first_text(channel, ["title"])
-    site = first_text(channel, ["link"])
-    entries: list[dict[str, str | None]] = []
 
-    for child in channel:
-        if local_name(child.tag) != "item":
-            continue
-        entries.append(
-            {
-                "guid": first_text(child, ["guid"]),
-                "title": first_text(child, ["title"]),
-                "url": first_text(child, ["link"]),
-                "published_raw": first_text(child, ["pubDate", "published", "updated"]),
-                "summary_raw": first_text(child, ["description", "summary", "content"]),
-            }
-        )
+def atom_entry(entry: ET.Element) -> dict[str, str | None]:
+    return extract_entry_fields(entry, ATOM_ENTRY_FIELDS, atom_links=True)
 
-    return {"feed_url": feed_url, "site": site, "title": feed_title}, entries
 
+def extract_entry_fields(
+    entry: ET.Element,
+    fields: dict[str, str],
+    atom_links: bool = False,
+) -> dict[str, str | None]:
+    # One walk over the entry subtree fills every field with the first non-empty
+    # match in document order. Atom links prefer the first rel="alternate" href,
+    # falling back to the first href of any rel.
+    out: dict[str, str | None] = dict.fromkeys(ENTRY_KEYS)
+    remaining = len(set(fields.values()))
+    first_href: str | None = None
 
-def parse_atom(root: ET.Element, feed_url: str) -> tuple[dict[str, str | None], list[dict[str, str | None]]]:
-    feed_title = first_text(root, ["title"])
-    site = first_attr(root, "link", "href")
-    entries: list[dict[str, str | None]] = []
+    for node in entry.iter():
+        tag = node.tag
+        name = tag.rsplit("}", 1)[-1] if "}" in tag else tag
 
-    for child in root:
-        if local_name(child.tag) != "entry":
+        if atom_links and name == "link":
+            href = (node.attrib.get("href") or "").strip()
+            if href and out["url"] is None:
+                rel = (node.attrib.get("rel") or "alternate").strip().lower()
+                if rel == "alternate":
+                    out["url"] = href
+                elif first_href is None:
+                    first_href = href
             continue
 
-        link = None
-        for link_node in child.iter():
-            if local_name(link_node.tag) != "link":
-                continue
-            href = (link_node.attrib.get("href") or "").strip()
-            rel = (link_node.attrib.get("rel") or "alternate").strip().lower()
-            if href and rel == "alternate":
-                link = href
-                break
-            if href and link is None:
-                link = href
-
-        entries.append(
-            {
-                "guid": first_text(child, ["id"]),
-                "title": first_text(child, ["title"]),
-                "url": link,
-                "published_raw": first_text(child, ["published", "updated"]),
-                "summary_raw": first_text(child, ["summary", "content"]),
-            }
-        )
+        key = fields.get(name)
+        if key is None or out[key] is not None:
+            continue
+        text = (node.text or "").strip()
+        if not text:
+            continue
+        out[key] = text
+        remaining -= 1
+        if remaining == 0 and (not atom_links or out["url"] is not None):
+            break
 
-    return {"feed_url": feed_url, "site": site, "title": feed_title}, entries
+    if atom_links and out["url"] is None:
+        out["url"] = first_href
+    return out
 
 
 def make_item_id(feed_url: str, raw: dict[str, str | None]) -> str:
@@ -319,20 +938,31 @@ def make_item_id(feed_url: str, raw: dict[str, str | None]) -> str:
 
 
 def normalize_item(feed_meta: dict[str, str | None], raw: dict[str, str | None], summary_max_chars: int) -> dict[str, Any]:
+    item_id = make_item_id(feed_meta["feed_url"] or "", raw)
+    return build_item(feed_meta, raw, item_id, parse_published(raw.get("published_raw")), summary_max_chars)
+
+
+def build_item(
+    feed_meta: dict[str, str | None],
+    raw: dict[str, str | None],
+    item_id: str,
+    published: datetime | None,
+    summary_max_chars: int,
+) -> dict[str, Any]:
     title = (raw.get("title") or "").strip()
     url = (raw.get("url") or "").strip()
-    summary_text = html_to_text(raw.get("summary_raw"), limit=None)
 
     if not title and not url:
         raise FeedProcessingError("normalize", "Item missing both title and url")
 
+    summary, words = summarize_html(raw.get("summary_raw"), summary_max_chars)
     return {
-        "id": make_item_id(feed_meta["feed_url"] or "", raw),
+        "id": item_id,
         "title": title,
         "url": url,
-        "published_at": parse_date_to_iso(raw.get("published_raw")),
-        "summary": html_to_text(raw.get("summary_raw"), limit=summary_max_chars),
-        "word_count": word_count(summary_text),
+        "published_at": published.isoformat() if published else None,
+        "summary": summary,
+        "word_count": words,
         "source": {
             "feed_url": feed_meta.get("feed_url") or "",
             "site": feed_meta.get("site"),
@@ -341,9 +971,183 @@ def normalize_item(feed_meta: dict[str, str | None], raw: dict[str, str | None],
     }
 
 
+def select_new_items(
+    xml_bytes: bytes,
+    feed_url: str,
+    seen_ids: SeenStore | set[str],
+    cutoff: datetime | None,
+    max_items: int,
+    summary_max_chars: int,
+) -> FeedSelection:
+    # Stage 1 runs per streamed entry on raw fields only, cheapest check first:
+    # date window, per-feed cap (which counts seen entries, as before), then ID
+    # dedupe. Stage 2 (HTML stripping, word counts) runs only for survivors.
+    feed_meta: dict[str, str | None] = {"feed_url": feed_url, "site": None, "title": None}
+    survivors: list[tuple[str, datetime | None, dict[str, str | None]]] = []
+    observed: list[datetime] = []
+    pending_ids: set[str] = set()
+    in_window = 0
+    stale_streak = 0
+    parsed = too_old = deduped = 0
+    capped = False
+
+    start = time.perf_counter()
+    entries = iter_feed_entries(xml_bytes, feed_meta)
+    for raw in entries:
+        parsed += 1
+        published = parse_published(raw.get("published_raw"))
+        if published:
+            observed.append(published)
+        if cutoff and published and published < cutoff:
+            too_old += 1
+            stale_streak += 1
+        else:
+            in_window += 1
+            item_id = make_item_id(feed_url, raw)
+            if item_id in seen_ids or item_id in pending_ids:
+                deduped += 1
+                stale_streak += 1
+            else:
+                stale_streak = 0
+                pending_ids.add(item_id)
+                survivors.append((item_id, published, raw))
+        if stale_streak >= STALE_STREAK_LIMIT:
+            break
+        if in_window >= max_items:
+            capped = next(entries, None) is not None
+            break
+
+    parse_done = time.perf_counter()
+    # Built in full before returning so a normalize error leaves no partial feed.
+    items = [build_item(feed_meta, raw, item_id, published, summary_max_chars) for item_id, published, raw in survivors]
+    return FeedSelection(
+        items=items,
+        feed_meta=feed_meta,
+        published=observed,
+        entries_parsed=parsed,
+        too_old=too_old,
+        deduped=deduped,
+        capped=capped,
+        parse_seconds=parse_done - start,
+        normalize_seconds=time.perf_counter() - parse_done,
+    )
+
+
+def parse_entries(
+    xml_bytes: bytes,
+    feed_url: str,
+    cutoff: datetime | None,
+    max_items: int,
+    summary_max_chars: int,
+) -> ParsedEntries:
+    # Runs in a parse worker. Stops on the cap or on a streak of too-old entries;
+    # a sequential parse stops there or earlier, since its streak also counts
+    # seen entries. Every in-window entry is normalized, seen or not.
+    feed_meta: dict[str, str | None] = {"feed_url": feed_url, "site": None, "title": None}
+    pending: list[tuple[str | None, datetime | None, dict[str, str | None] | None]] = []
+    in_window = old_streak = 0
+    capped = False
+    error = None
+
+    start = time.perf_counter()
+    entries = iter_feed_entries(xml_bytes, feed_meta)
+    try:
+        for raw in entries:
+            published = parse_published(raw.get("published_raw"))
+            if cutoff and published and published < cutoff:
+                old_streak += 1
+                pending.append((None, published, None))
+            else:
+                in_window += 1
+                old_streak = 0
+                pending.append((make_item_id(feed_url, raw), published, raw))
+            if old_streak >= STALE_STREAK_LIMIT:
+                break
+            if in_window >= max_items:
+                capped = next(entries, None) is not None
+                break
+    except FeedProcessingError as e:
+        error = (e.stage, e.message)
+
+    parse_done = time.perf_counter()
+    parsed: list[tuple[str | None, datetime | None, dict[str, Any] | None, str | None]] = []
+    for item_id, published, raw in pending:
+        if item_id is None or raw is None:
+            parsed.append((None, published, None, None))
+            continue
+        try:
+            parsed.append((item_id, published, build_item(feed_meta, raw, item_id, published, summary_max_chars), None))
+        except FeedProcessingError as e:
+            parsed.append((item_id, published, None, e.message))
+    return ParsedEntries(
+        feed_meta=feed_meta,
+        entries=parsed,
+        capped=capped,
+        error=error,
+        parse_seconds=parse_done - start,
+        normalize_seconds=time.perf_counter() - parse_done,
+    )
+
+
+def select_parsed_items(parsed: ParsedEntries, seen_ids: SeenStore | set[str], max_items: int) -> FeedSelection:
+    # Replays select_new_items() stage 1 over a worker parse, in feed order and
+    # against the live seen store, so the kept items, counters and errors match
+    # a sequential run exactly.
+    survivors: list[tuple[dict[str, Any] | None, str | None]] = []
+    observed: list[datetime] = []
+    pending_ids: set[str] = set()
+    in_window = stale_streak = 0
+    parsed_count = too_old = deduped = 0
+    capped = False
+    reads_past_end = True
+
+    for item_id, published, item, normalize_error in parsed.entries:
+        parsed_count += 1
+        if published:
+            observed.append(published)
+        if item_id is None:
+            too_old += 1
+            stale_streak += 1
+        else:
+            in_window += 1
+            if item_id in seen_ids or item_id in pending_ids:
+                deduped += 1
+                stale_streak += 1
+            else:
+                stale_streak = 0
+                pending_ids.add(item_id)
+                survivors.append((item, normalize_error))
+        if stale_streak >= STALE_STREAK_LIMIT:
+            reads_past_end = False
+            break
+        if in_window >= max_items:
+            # The worker stopped on the same entry, after peeking one further.
+            capped = parsed.capped
+            break
+
+    if parsed.error is not None and reads_past_end and parsed_count == len(parsed.entries):
+        raise FeedProcessingError(*parsed.error)
+    items: list[dict[str, Any]] = []
+    for item, normalize_error in survivors:
+        if item is None:
+            raise FeedProcessingError("normalize", normalize_error or "normalize failed")
+        items.append(item)
+    return FeedSelection(
+        items=items,
+        feed_meta=parsed.feed_meta,
+        published=observed,
+        entries_parsed=parsed_count,
+        too_old=too_old,
+        deduped=deduped,
+        capped=capped,
+        parse_seconds=parsed.parse_seconds,
+        normalize_seconds=parsed.normalize_seconds,
+    )
+
+
 def load_state(path: Path) -> dict[str, Any]:
     if not path.exists():
-        return {"version": 1, "seen_ids": [], "feeds": {}}
+        return {"version": 1, "feeds": {}}
 
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
@@ -354,10 +1158,9 @@ def load_state(path: Path) -> dict[str, Any]:
         raise FeedProcessingError("input", f"State file must be a JSON object: {path}")
 
     data.setdefault("version", 1)
-    data.setdefault("seen_ids", [])
     data.setdefault("feeds", {})
 
-    if not isinstance(data["seen_ids"], list):
+    if "seen_ids" in data and not isinstance(data["seen_ids"], list):
         raise FeedProcessingError("input", "state.seen_ids must be an array")
     if not isinstance(data["feeds"], dict):
         raise FeedProcessingError("input", "state.feeds must be an object")
@@ -365,43 +1168,114 @@ def load_state(path: Path) -> dict[str, Any]:
     return data
 
 
+def open_seen_store(backend: str, state: dict[str, Any], store_path: Path) -> SeenStore:
+    if backend == "json":
+        return JsonSeenStore(state)
+
+    store = SqliteSeenStore(store_path)
+    # One-time migration: IDs still listed in state.json move into the store and
+    # are dropped from state when it is next saved.
+    legacy_ids = state.get("seen_ids")
+    if legacy_ids:
+        store.import_ids(legacy_ids)
+    return store
+
+
 def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def write_json(path: Path, payload: Any) -> None:
+def write_text_atomic(path: Path, text: str) -> None:
+    # Readers (and a watch-mode rewrite racing a consumer) never see a half-written file.
     ensure_parent(path)
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_json(path: Path, payload: Any) -> None:
+    write_text_atomic(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
 
 
 def build_digest(items: list[dict[str, Any]]) -> str:
-    lines = ["# Feed Digest", ""]
     if not items:
-        lines.append("No new items.")
-        lines.append("")
-        return "\n".join(lines)
-
-    for item in items:
-        title = item.get("title") or "(untitled)"
-        url = item.get("url") or ""
-        published = item.get("published_at") or "unknown"
-        source_title = item.get("source", {}).get("title") or item.get("source", {}).get("feed_url") or "unknown"
-
-        lines.append(f"## {title}")
-        lines.append("")
-        lines.append(f"- Source: {source_title}")
-        lines.append(f"- Published: {published}")
-        if url:
-            lines.append(f"- URL: {url}")
-        summary = item.get("summary") or ""
-        if summary:
-            lines.append(f"- Summary: {summary}")
-        lines.append("")
-
-    return "\n".join(lines)
-
-
-def update_feed_status(state: dict[str, Any], feed_url: str, success: bool, error_message: str | None = None) -> None:
+        return DIGEST_HEADER + DIGEST_EMPTY
+    return DIGEST_HEADER + "\n".join(digest_section(item) for item in items)
+
+
+def digest_section(item: dict[str, Any]) -> str:
+    # Sections are joined by a blank line; streamed digests append them one by one.
+    title = item.get("title") or "(untitled)"
+    url = item.get("url") or ""
+    published = item.get("published_at") or "unknown"
+    source_title = item.get("source", {}).get("title") or item.get("source", {}).get("feed_url") or "unknown"
+
+    lines = [f"## {title}", "", f"- Source: {source_title}", f"- Published: {published}"]
+    if url:
+        lines.append(f"- URL: {url}")
+    summary = item.get("summary") or ""
+    if summary:
+        lines.append(f"- Summary: {summary}")
+    return "\n".join(lines) + "\n"
+
+
+def ndjson_lines(records: list[dict[str, Any]]) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+class NdjsonOutputs:
+    # Streams items.json / errors.json as one JSON object per line, and appends
+    # digest.md sections, as each feed completes. Everything is written to
+    # "<name>.partial" and renamed into place by finalize(), so a reader of the
+    # final names never sees a half-finished run.
+    NAMES = ("items.json", "errors.json", "digest.md")
+
+    def __init__(self, out_dir: Path) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self._paths = {name: out_dir / name for name in self.NAMES}
+        self._files = {name: self._partial(path).open("w", encoding="utf-8") for name, path in self._paths.items()}
+        self._files["digest.md"].write(DIGEST_HEADER)
+        self.items = 0
+        self.errors = 0
+
+    @staticmethod
+    def _partial(path: Path) -> Path:
+        return path.with_name(path.name + ".partial")
+
+    def write(self, result: FeedResult) -> None:
+        digest = self._files["digest.md"]
+        for item in result.items:
+            if self.items:
+                digest.write("\n")
+            digest.write(digest_section(item))
+            self.items += 1
+        self._files["items.json"].write(ndjson_lines(result.items))
+        if result.error is not None:
+            self._files["errors.json"].write(ndjson_lines([result.error]))
+            self.errors += 1
+        for f in self._files.values():
+            f.flush()
+
+    def finalize(self) -> None:
+        if not self.items:
+            self._files["digest.md"].write(DIGEST_EMPTY)
+        self.close()
+        for path in self._paths.values():
+            os.replace(self._partial(path), path)
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+
+
+def update_feed_status(
+    state: dict[str, Any],
+    feed_url: str,
+    success: bool,
+    error_message: str | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> None:
     feed_meta = state["feeds"].setdefault(
         feed_url,
         {
@@ -417,6 +1291,8 @@ def update_feed_status(state: dict[str, Any], feed_url: str, success: bool, erro
         feed_meta["last_success_at"] = now_iso()
         feed_meta["last_error_at"] = None
         feed_meta["last_error"] = None
+        feed_meta["etag"] = etag
+        feed_meta["last_modified"] = last_modified
     else:
         feed_meta["last_error_at"] = now_iso()
         feed_meta["last_error"] = error_message
@@ -435,8 +1311,54 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     p.add_argument("--summary-max-chars", type=int, default=800, help="Max summary characters per item")
     p.add_argument("--max-items-per-feed", type=int, default=20, help="Max items per feed")
     p.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout seconds")
+    p.add_argument("--concurrency", type=int, default=1, help="Max feeds fetched in parallel")
+    p.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse and normalize bodies in N worker processes while fetching continues (0: in-process)",
+    )
+    p.add_argument("--per-host-concurrency", type=int, default=2, help="Max parallel requests to any one host")
+    p.add_argument("--breaker-threshold", type=int, default=DEFAULT_BREAKER_THRESHOLD, help="Consecutive connection failures before a host's remaining feeds fail fast")
+    p.add_argument(
+        "--health-state",
+        default=None,
+        help="feed_health.py state used to seed the per-host circuit breaker (default: feed_health_state.json next to the state file)",
+    )
     p.add_argument("--state-file", default=None, help="Path to state.json")
+    p.add_argument("--seen-backend", choices=["sqlite", "json"], default="sqlite", help="Dedupe ID store backend")
+    p.add_argument("--seen-store", default=None, help="Path to the sqlite seen-ID store (default: <state-file>.seen.sqlite)")
+    p.add_argument("--seen-ttl-days", type=float, default=None, help="Forget seen IDs not encountered for N days (sqlite only)")
+    p.add_argument(
+        "--body-cache",
+        default=None,
+        help="Directory for an LRU store of raw feed bodies, used to re-parse a 304 when the last parse does not cover this run",
+    )
+    p.add_argument("--body-cache-max-mb", type=float, default=DEFAULT_BODY_CACHE_MB, help="Size bound for --body-cache in MiB")
+    p.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help="Only process feeds hashed to shard i of N (e.g. 2/4); merge shard outputs with shard_merge.py",
+    )
     p.add_argument("--skip-network-check", action="store_true", help="Skip startup internet connectivity preflight")
+    p.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="items.json/errors.json layout: one JSON array, or one object per line streamed as feeds complete",
+    )
+    p.add_argument(
+        "--metrics-prom",
+        default=None,
+        help="Also write run metrics in Prometheus text format to this path (e.g. a node_exporter textfile *.prom)",
+    )
+    p.add_argument("--watch", action="store_true", help="Keep running and poll each feed on its own adaptive interval")
+    p.add_argument("--watch-min-interval", type=float, default=5.0, help="Shortest per-feed poll interval in minutes (watch mode)")
+    p.add_argument("--watch-default-interval", type=float, default=60.0, help="Poll interval in minutes before a feed's cadence is known (watch mode)")
+    p.add_argument("--watch-max-interval", type=float, default=1440.0, help="Longest per-feed poll interval in minutes (watch mode)")
+    p.add_argument("--watch-retain-hours", type=float, default=24.0, help="Hours newly found items stay in items.json/digest.md (watch mode)")
+    p.add_argument("--watch-max-cycles", type=int, default=None, help="Exit after N polling ticks (watch mode)")
     return p.parse_args(argv)
 
 
@@ -472,79 +1394,658 @@ def run(argv: list[str]) -> int:
         raise FeedProcessingError("input", "--since-hours must be >= 0")
     if args.summary_max_chars <= 0:
         raise FeedProcessingError("input", "--summary-max-chars must be > 0")
+    if args.concurrency <= 0:
+        raise FeedProcessingError("input", "--concurrency must be > 0")
+    if args.parse_workers < 0:
+        raise FeedProcessingError("input", "--parse-workers must be >= 0")
+    if args.per_host_concurrency <= 0:
+        raise FeedProcessingError("input", "--per-host-concurrency must be > 0")
+    if args.breaker_threshold <= 0:
+        raise FeedProcessingError("input", "--breaker-threshold must be > 0")
+    if args.seen_ttl_days is not None and args.seen_ttl_days <= 0:
+        raise FeedProcessingError("input", "--seen-ttl-days must be > 0")
+    if args.seen_ttl_days is not None and args.seen_backend != "sqlite":
+        raise FeedProcessingError("input", "--seen-ttl-days requires --seen-backend sqlite")
+    if args.body_cache_max_mb <= 0:
+        raise FeedProcessingError("input", "--body-cache-max-mb must be > 0")
+    if min(args.watch_min_interval, args.watch_default_interval, args.watch_retain_hours) <= 0:
+        raise FeedProcessingError("input", "--watch-min-interval, --watch-default-interval and --watch-retain-hours must be > 0")
+    if args.watch_max_interval < args.watch_min_interval:
+        raise FeedProcessingError("input", "--watch-max-interval must be >= --watch-min-interval")
+    if args.watch_max_cycles is not None and args.watch_max_cycles <= 0:
+        raise FeedProcessingError("input", "--watch-max-cycles must be > 0")
 
     feeds_path = Path(args.feeds)
     out_dir, state_path = resolve_output_paths(args)
 
     feeds = read_feeds_file(feeds_path)
+    if args.shard:
+        feeds = [feed_url for feed_url in feeds if shard_of(feed_url, args.shard[1]) == args.shard[0]]
+        if args.watch and not feeds:
+            raise FeedProcessingError("input", f"Shard {args.shard[0]}/{args.shard[1]} has no feeds to watch")
+    pool = ConnectionPool(timeout=args.timeout, per_host_limit=args.per_host_concurrency)
+    try:
+        return run_feeds(args, feeds, pool, out_dir, state_path)
+    finally:
+        pool.close()
+
+
+def run_feeds(args: argparse.Namespace, feeds: list[str], pool: ConnectionPool, out_dir: Path, state_path: Path) -> int:
+    metrics = RunMetrics()
     if not args.skip_network_check and any(is_http_url(feed_url) for feed_url in feeds):
-        preflight_network_check(timeout=args.timeout, user_agent=DEFAULT_USER_AGENT)
+        with metrics.stage("preflight"):
+            preflight_network_check(timeout=args.timeout, user_agent=DEFAULT_USER_AGENT, pool=pool, feed_urls=feeds)
+
+    with metrics.stage("load_state"):
+        state = load_state(state_path)
+        seen_store_path = Path(args.seen_store) if args.seen_store else state_path.with_suffix(".seen.sqlite")
+        seen_ids = open_seen_store(args.seen_backend, state, seen_store_path)
+        if args.shard:
+            # Lets shard_merge.py check that it has exactly one output per shard
+            # and find the shard's sqlite seen store wherever --seen-store put it.
+            state["shard"] = {"index": args.shard[0], "count": args.shard[1]}
+            if args.seen_backend == "sqlite":
+                state["shard"]["seen_store"] = str(seen_store_path.resolve())
+    try:
+        if args.watch:
+            return watch_feeds(args, feeds, pool, out_dir, state_path, state, seen_ids, metrics)
+        return process_feeds(args, feeds, pool, out_dir, state_path, state, seen_ids, metrics)
+    finally:
+        seen_ids.close()
 
-    state = load_state(state_path)
 
-    seen_ids = set(str(x) for x in state.get("seen_ids", []))
-    errors: list[dict[str, Any]] = []
-    new_items: list[dict[str, Any]] = []
+def build_breaker(args: argparse.Namespace, feeds: list[str], state_path: Path) -> HostCircuitBreaker:
+    health_path = Path(args.health_state) if args.health_state else state_path.parent / "feed_health_state.json"
+    return HostCircuitBreaker(args.breaker_threshold, load_breaker_seeds(health_path, feeds))
 
-    cutoff = None
-    if args.since_hours is not None:
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=args.since_hours)
 
-    for feed_url in feeds:
-        try:
-            xml_bytes, status_code, attempts = fetch_feed_bytes(feed_url, timeout=args.timeout, user_agent=DEFAULT_USER_AGENT)
-            feed_meta, raw_items = parse_feed(xml_bytes, feed_url)
-
-            feed_items: list[dict[str, Any]] = []
-            for raw in raw_items:
-                item = normalize_item(feed_meta, raw, summary_max_chars=args.summary_max_chars)
-                if cutoff and item["published_at"]:
-                    parsed = datetime.fromisoformat(item["published_at"].replace("Z", "+00:00"))
-                    if parsed < cutoff:
-                        continue
-                feed_items.append(item)
-
-            for item in feed_items[: args.max_items_per_feed]:
-                if item["id"] in seen_ids:
-                    continue
-                seen_ids.add(item["id"])
-                new_items.append(item)
+def build_body_cache(args: argparse.Namespace) -> BodyCache | None:
+    if not args.body_cache:
+        return None
+    return BodyCache(Path(args.body_cache), int(args.body_cache_max_mb * 1024 * 1024))
 
-            update_feed_status(state, feed_url, success=True)
-        except FeedProcessingError as e:
-            update_feed_status(state, feed_url, success=False, error_message=e.message)
-            errors.append(
-                {
-                    "feed_url": feed_url,
-                    "stage": e.stage,
-                    "error": e.message,
-                    "attempts": e.attempts,
-                    "status_code": e.status_code,
-                    "timestamp": now_iso(),
-                }
+
+def since_cutoff(args: argparse.Namespace) -> datetime | None:
+    if args.since_hours is None:
+        return None
+    return datetime.now(timezone.utc) - timedelta(hours=args.since_hours)
+
+
+def error_record(feed_url: str, stage: str, message: str, attempts: int, status_code: int) -> dict[str, Any]:
+    return {
+        "feed_url": feed_url,
+        "stage": stage,
+        "error": message,
+        "attempts": attempts,
+        "status_code": status_code,
+        "timestamp": now_iso(),
+    }
+
+
+def iter_feed_results(
+    options: FetchOptions,
+    feeds: list[str],
+    pool: ConnectionPool,
+    breaker: HostCircuitBreaker,
+    state: dict[str, Any],
+    seen_ids: SeenStore,
+    cutoff: datetime | None,
+    body_cache: BodyCache | None = None,
+    parse_pool: Executor | None = None,
+) -> Iterator[FeedResult]:
+    # One sweep over feeds, in feed order. Feed status and the seen store are
+    # updated before each result is yielded.
+    outcomes = iter_fetch_outcomes(
+        feeds,
+        timeout=options.timeout,
+        user_agent=options.user_agent,
+        concurrency=options.concurrency,
+        validators=conditional_validators(state),
+        pool=pool,
+        breaker=breaker,
+    )
+    if parse_pool is None:
+        for outcome in outcomes:
+            result = feed_result(options, outcome, state, seen_ids, cutoff, body_cache)
+            result.metrics = feed_metrics(outcome, result)
+            yield result
+        return
+
+    # Bodies are shipped to parse workers as soon as they arrive while fetching
+    # continues; results are still finished (dedupe, state, body cache) here,
+    # one at a time in feed order.
+    backlog = max(1, options.parse_workers) * PARSE_BACKLOG_PER_WORKER
+    pending: deque[tuple[FetchOutcome, ParseJob]] = deque()
+
+    def finish_head() -> FeedResult:
+        outcome, job = pending.popleft()
+        result = feed_result(options, outcome, state, seen_ids, cutoff, body_cache, job)
+        result.metrics = feed_metrics(outcome, result)
+        return result
+
+    for outcome in outcomes:
+        job = ParseJob(None)
+        if outcome.error is None:
+            try:
+                job.body = body_to_parse(options, outcome, state, cutoff, body_cache)
+            except Exception as e:
+                job.error = e
+        if job.body is not None:
+            job.future = parse_pool.submit(parse_entries, job.body[0], outcome.feed_url, cutoff, options.max_items_per_feed, options.summary_max_chars)
+        pending.append((outcome, job))
+        while pending and (len(pending) > backlog or pending[0][1].future is None or pending[0][1].future.done()):
+            yield finish_head()
+    while pending:
+        yield finish_head()
+
+
+def body_to_parse(
+    options: FetchOptions,
+    outcome: FetchOutcome,
+    state: dict[str, Any],
+    cutoff: datetime | None,
+    body_cache: BodyCache | None = None,
+) -> tuple[bytes, str] | None:
+    # The body and digest feed_result() must parse, or None when the last parse
+    # of this feed already covers the run.
+    meta = state["feeds"].get(outcome.feed_url) or {}
+    covered = body_parse_covers(meta, cutoff, options.max_items_per_feed)
+    if outcome.not_modified:
+        # A 304 is re-parsed from the stored body only when the last parse
+        # does not cover this run (wider window, larger cap, or stale).
+        if body_cache is None or not meta.get("body_sha256") or covered:
+            return None
+        data = body_cache.get(meta["body_sha256"])
+        return (data, meta["body_sha256"]) if data is not None else None
+    digest = hashlib.sha256(outcome.data).hexdigest()
+    if digest == meta.get("body_sha256") and covered:
+        return None
+    return outcome.data, digest
+
+
+def feed_result(
+    options: FetchOptions,
+    outcome: FetchOutcome,
+    state: dict[str, Any],
+    seen_ids: SeenStore,
+    cutoff: datetime | None,
+    body_cache: BodyCache | None = None,
+    job: ParseJob | None = None,
+) -> FeedResult:
+    feed_url = outcome.feed_url
+    try:
+        if outcome.error is not None:
+            raise outcome.error
+        if job is not None and job.error is not None:
+            raise job.error
+        body = job.body if job is not None else body_to_parse(options, outcome, state, cutoff, body_cache)
+        if body is None:
+            update_feed_status(state, feed_url, success=True, etag=outcome.etag, last_modified=outcome.last_modified)
+            return FeedResult(feed_url, not_modified=True, body_digest=None if outcome.not_modified else "unchanged")
+        data, digest = body
+        if job is not None and job.future is not None:
+            selection = select_parsed_items(job.future.result(), seen_ids, options.max_items_per_feed)
+        else:
+            selection = select_new_items(
+                data,
+                feed_url,
+                seen_ids,
+                cutoff=cutoff,
+                max_items=options.max_items_per_feed,
+                summary_max_chars=options.summary_max_chars,
             )
-        except Exception as e:  # pragma: no cover
-            update_feed_status(state, feed_url, success=False, error_message=str(e))
-            errors.append(
-                {
-                    "feed_url": feed_url,
-                    "stage": "unknown",
-                    "error": f"{type(e).__name__}: {e}",
-                    "attempts": 1,
-                    "status_code": 0,
-                    "timestamp": now_iso(),
-                }
+        for item in selection.items:
+            seen_ids.add(item["id"])
+
+        previous_digest = (state["feeds"].get(feed_url) or {}).get("body_sha256")
+        update_feed_status(state, feed_url, success=True, etag=outcome.etag, last_modified=outcome.last_modified)
+        if body_cache is not None and not outcome.not_modified:
+            if previous_digest and previous_digest != digest:
+                body_cache.discard(previous_digest)
+            body_cache.put(digest, data)
+        record_body_parse(state["feeds"][feed_url], digest, cutoff, options.max_items_per_feed if selection.capped else None)
+        body_digest = None if outcome.not_modified else "changed"
+        return FeedResult(feed_url, items=selection.items, selection=selection, body_digest=body_digest)
+    except FeedProcessingError as e:
+        update_feed_status(state, feed_url, success=False, error_message=e.message)
+        return FeedResult(feed_url, error=error_record(feed_url, e.stage, e.message, e.attempts, e.status_code))
+    except Exception as e:  # pragma: no cover
+        update_feed_status(state, feed_url, success=False, error_message=str(e))
+        return FeedResult(feed_url, error=error_record(feed_url, "unknown", f"{type(e).__name__}: {e}", 1, 0))
+
+
+def body_parse_covers(meta: dict[str, Any], cutoff: datetime | None, max_items: int) -> bool:
+    # Whether re-parsing the last parsed body could select anything the last
+    # parse did not: an identical body under the same or a later cutoff and no
+    # larger cap yields only IDs that are already seen or too old.
+    parsed_at = meta.get("body_parsed_at")
+    if not meta.get("body_sha256") or not parsed_at:
+        return False
+    if (datetime.now(timezone.utc) - datetime.fromisoformat(parsed_at)).total_seconds() > BODY_DIGEST_MAX_AGE_SECONDS:
+        return False
+    body_cutoff = meta.get("body_cutoff")
+    if body_cutoff is not None and (cutoff is None or cutoff < datetime.fromisoformat(body_cutoff)):
+        return False
+    body_cap = meta.get("body_cap")
+    return body_cap is None or max_items <= body_cap
+
+
+def record_body_parse(meta: dict[str, Any], digest: str, cutoff: datetime | None, cap: int | None) -> None:
+    meta["body_sha256"] = digest
+    meta["body_parsed_at"] = now_iso()
+    meta["body_cutoff"] = cutoff.isoformat() if cutoff else None
+    meta["body_cap"] = cap
+
+
+def feed_metrics(outcome: FetchOutcome, result: FeedResult) -> dict[str, Any]:
+    selection = result.selection
+    return {
+        "feed_url": outcome.feed_url,
+        "status": feed_status(result),
+        "status_code": result.error["status_code"] if result.error else outcome.status_code,
+        "attempts": outcome.attempts,
+        "fetch_seconds": round(outcome.fetch_seconds, 6),
+        "elapsed_seconds": round(outcome.elapsed_seconds, 6),
+        "bytes": len(outcome.data),
+        "wire_bytes": outcome.wire_bytes,
+        "parse_seconds": round(selection.parse_seconds, 6) if selection else 0.0,
+        "normalize_seconds": round(selection.normalize_seconds, 6) if selection else 0.0,
+        "entries_parsed": selection.entries_parsed if selection else 0,
+        "items_kept": len(result.items),
+        "items_deduped": selection.deduped if selection else 0,
+        "items_too_old": selection.too_old if selection else 0,
+        "body_digest": result.body_digest,
+    }
+
+
+class FetchRun:
+    """One lazy sweep over feeds: iterating yields new FeedItem objects in feed order.
+
+    ``errors`` gains a FeedErrorRecord per failed feed as the sweep reaches it.
+    ``state`` (feed status and ETag/Last-Modified validators) and ``store`` are
+    updated in place; persisting them is left to the caller.
+    """
+
+    def __init__(
+        self,
+        feeds: Iterable[str],
+        cutoff: datetime | None,
+        store: SeenStore,
+        state: dict[str, Any],
+        options: FetchOptions,
+        pool: ConnectionPool | None = None,
+        breaker: HostCircuitBreaker | None = None,
+        body_cache: BodyCache | None = None,
+        parse_pool: Executor | None = None,
+    ) -> None:
+        self.feeds = list(feeds)
+        self.cutoff = cutoff
+        self.store = store
+        self.state = state
+        self.options = options
+        self.pool = pool
+        self.breaker = breaker or HostCircuitBreaker(DEFAULT_BREAKER_THRESHOLD)
+        self.body_cache = body_cache
+        self.parse_pool = parse_pool
+        self.errors: list[FeedErrorRecord] = []
+        self._started = False
+
+    def results(self) -> Iterator[FeedResult]:
+        # Per-feed results (items as items.json dicts, plus metrics); used by the CLI.
+        if self._started:
+            raise RuntimeError("FetchRun can only be iterated once")
+        self._started = True
+        pool = self.pool or ConnectionPool(timeout=self.options.timeout)
+        parse_pool = self.parse_pool
+        if parse_pool is None and self.options.parse_workers > 0:
+            parse_pool = open_parse_pool(self.options.parse_workers)
+        try:
+            results = iter_feed_results(
+                self.options, self.feeds, pool, self.breaker, self.state, self.store, self.cutoff, self.body_cache, parse_pool
             )
+            for result in results:
+                if result.error is not None:
+                    self.errors.append(FeedErrorRecord(**result.error))
+                yield result
+        finally:
+            if self.pool is None:
+                pool.close()
+            if parse_pool is not None and self.parse_pool is None:
+                parse_pool.shutdown(cancel_futures=True)
+
+    def __iter__(self) -> Iterator[FeedItem]:
+        for result in self.results():
+            for item in result.items:
+                yield FeedItem.from_dict(item)
+
+
+def open_parse_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn, not fork: fetch worker threads are already running in this process.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def fetch_items(
+    feeds: Iterable[str],
+    since: datetime | timedelta | None = None,
+    store: SeenStore | None = None,
+    state: dict[str, Any] | None = None,
+    options: FetchOptions | None = None,
+    pool: ConnectionPool | None = None,
+    breaker: HostCircuitBreaker | None = None,
+    body_cache: BodyCache | None = None,
+) -> FetchRun:
+    # In-process entry point. since is an absolute cutoff or a window back from
+    # now; without a store, dedupe uses state["seen_ids"] in memory.
+    options = options or FetchOptions()
+    options.validate()
+    cutoff = datetime.now(timezone.utc) - since if isinstance(since, timedelta) else since
+    if cutoff is not None and cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    state = state if state is not None else {"version": 1, "feeds": {}}
+    state.setdefault("feeds", {})
+    return FetchRun(feeds, cutoff, store if store is not None else JsonSeenStore(state), state, options, pool, breaker, body_cache)
+
+
+def process_feeds(
+    args: argparse.Namespace,
+    feeds: list[str],
+    pool: ConnectionPool,
+    out_dir: Path,
+    state_path: Path,
+    state: dict[str, Any],
+    seen_ids: SeenStore,
+    metrics: RunMetrics,
+) -> int:
+    started_at = now_iso()
+    errors: list[dict[str, Any]] = []
+    new_items: list[dict[str, Any]] = []
+    feed_rows: list[dict[str, Any]] = []
+    new_count = 0
+    # In ndjson mode items go straight to disk as each feed completes instead
+    # of accumulating for one write at the end.
+    stream = NdjsonOutputs(out_dir) if args.format == "ndjson" else None
+
+    breaker = build_breaker(args, feeds, state_path)
+    body_cache = build_body_cache(args)
+    try:
+        with metrics.stage("fetch_and_parse"):
+            fetch_run = FetchRun(feeds, since_cutoff(args), seen_ids, state, FetchOptions.from_args(args), pool, breaker, body_cache)
+            for result in fetch_run.results():
+                new_count += len(result.items)
+                feed_rows.append(feed_row(result))
+                metrics.add_feed(result.metrics)
+                if result.error is not None:
+                    errors.append(result.error)
+                if stream is not None:
+                    stream.write(result)
+                else:
+                    new_items.extend(result.items)
+    except BaseException:
+        if stream is not None:
+            stream.close()
+        raise
+
+    with metrics.stage("save_seen"):
+        seen_ids.save(state)
+        if args.seen_ttl_days is not None:
+            seen_ids.evict_older_than(args.seen_ttl_days)
+
+    with metrics.stage("write_outputs"):
+        if stream is not None:
+            stream.finalize()
+            write_json(state_path, state)
+        else:
+            write_outputs(out_dir, state_path, state, new_items, errors)
+    if args.runs_root:
+        with metrics.stage("index"):
+            items = iter_records(out_dir / "items.json") if stream is not None else new_items
+            index_run(Path(args.runs_root), run_id_for(Path(args.runs_root), out_dir), out_dir, started_at, feed_rows, items, errors)
+    write_metrics(args, out_dir, metrics, pool)
+
+    summary = {
+        "feeds": len(feeds),
+        "new_items": new_count,
+        "errors": len(errors),
+        "connections": pool.stats(),
+        "circuit_open_hosts": breaker.open_hosts(),
+        "body_digest": metrics.body_digest(),
+    }
+    if args.shard:
+        summary["shard"] = f"{args.shard[0]}/{args.shard[1]}"
+    if body_cache is not None:
+        summary["body_cache"] = body_cache.stats()
+    print(json.dumps(summary, indent=2))
+    return 2 if errors else 0
+
 
-    state["seen_ids"] = sorted(seen_ids)
+def write_metrics(args: argparse.Namespace, out_dir: Path, metrics: RunMetrics, pool: ConnectionPool) -> None:
+    report = metrics.report(pool.stats())
+    write_json(out_dir / "metrics.json", report)
+    if args.metrics_prom:
+        write_text_atomic(Path(args.metrics_prom), prometheus_text(report))
 
+
+def feed_status(result: FeedResult) -> str:
+    return "error" if result.error is not None else "not_modified" if result.not_modified else "ok"
+
+
+def feed_row(result: FeedResult) -> dict[str, Any]:
+    return {"feed_url": result.feed_url, "status": feed_status(result), "new_items": len(result.items)}
+
+
+def index_run(
+    runs_root: Path,
+    run_id: str,
+    out_dir: Path,
+    started_at: str,
+    feed_rows: list[dict[str, Any]],
+    items: Iterable[dict[str, Any]],
+    errors: list[dict[str, Any]],
+) -> None:
+    # The run's files are already written; a broken index only costs a warning.
+    try:
+        index = RunIndex(runs_root / INDEX_NAME)
+        try:
+            index.record_run(run_id, out_dir, started_at, now_iso(), feed_rows, items, errors)
+        finally:
+            index.close()
+    except sqlite3.Error as e:
+        sys.stderr.write(f"index warning: could not record run {run_id}: {e}\n")
+
+
+def write_outputs(
+    out_dir: Path,
+    state_path: Path,
+    state: dict[str, Any],
+    items: list[dict[str, Any]],
+    errors: list[dict[str, Any]],
+    fmt: str = "json",
+) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
-    write_json(out_dir / "items.json", new_items)
-    (out_dir / "digest.md").write_text(build_digest(new_items), encoding="utf-8")
-    write_json(out_dir / "errors.json", errors)
+    if fmt == "ndjson":
+        write_text_atomic(out_dir / "items.json", ndjson_lines(items))
+        write_text_atomic(out_dir / "errors.json", ndjson_lines(errors))
+    else:
+        write_json(out_dir / "items.json", items)
+        write_json(out_dir / "errors.json", errors)
+    write_text_atomic(out_dir / "digest.md", build_digest(items))
     write_json(state_path, state)
 
-    return 2 if errors else 0
+
+def feed_hint_seconds(feed_meta: dict[str, str | None]) -> float | None:
+    # The longest interval the feed itself advertises: <ttl> minutes, or one
+    # sy:updatePeriod divided by sy:updateFrequency (period defaults to daily).
+    hints: list[float] = []
+    ttl = feed_meta.get("ttl") or ""
+    if ttl.isdigit() and int(ttl) > 0:
+        hints.append(int(ttl) * 60.0)
+    frequency = feed_meta.get("update_frequency") or ""
+    period = (feed_meta.get("update_period") or ("daily" if frequency else "")).lower()
+    if period in SY_PERIOD_SECONDS:
+        divisor = int(frequency) if frequency.isdigit() and int(frequency) > 0 else 1
+        hints.append(SY_PERIOD_SECONDS[period] / divisor)
+    return max(hints) if hints else None
+
+
+def publish_cadence(published: list[datetime]) -> float | None:
+    # Median gap between the most recent distinct publish times.
+    recent = sorted(set(published), reverse=True)[:CADENCE_SAMPLE]
+    gaps = [(newer - older).total_seconds() for newer, older in zip(recent, recent[1:])]
+    return statistics.median(gaps) if gaps else None
+
+
+def next_poll_interval(
+    previous: float | None,
+    cadence: float | None,
+    hint: float | None,
+    found_new: bool,
+    failed: bool,
+    bounds: tuple[float, float, float],
+) -> float:
+    min_s, default_s, max_s = bounds
+    if failed:
+        interval = (previous or default_s) * WATCH_ERROR_BACKOFF
+    else:
+        # Poll about twice per typical publish gap, but never more often than
+        # the feed asks; every poll that finds nothing new stretches the wait.
+        target = cadence / 2 if cadence else default_s
+        if hint:
+            target = max(target, hint)
+        interval = target if found_new or previous is None else max(target, previous * WATCH_IDLE_BACKOFF)
+    return min(max(interval, min_s), max_s)
+
+
+def schedule_feed(state: dict[str, Any], result: FeedResult, bounds: tuple[float, float, float], now: float) -> float:
+    feed_meta = state["feeds"][result.feed_url]
+    if result.selection is not None:
+        cadence = publish_cadence(result.selection.published)
+        if cadence is not None:
+            feed_meta["publish_cadence_seconds"] = round(cadence, 1)
+        feed_meta["poll_hint_seconds"] = feed_hint_seconds(result.selection.feed_meta)
+
+    interval = next_poll_interval(
+        feed_meta.get("poll_interval_seconds"),
+        feed_meta.get("publish_cadence_seconds"),
+        feed_meta.get("poll_hint_seconds"),
+        found_new=bool(result.items),
+        failed=result.error is not None,
+        bounds=bounds,
+    )
+    feed_meta["poll_interval_seconds"] = round(interval, 1)
+    feed_meta["next_poll_at"] = datetime.fromtimestamp(now + interval, timezone.utc).replace(microsecond=0).isoformat()
+    return now + interval
+
+
+def initial_due_times(state: dict[str, Any], feeds: list[str], now: float, max_interval: float) -> dict[str, float]:
+    # Resume a previous watch schedule, but never wait longer than the current maximum.
+    due: dict[str, float] = {}
+    for feed_url in feeds:
+        next_poll_at = state["feeds"].get(feed_url, {}).get("next_poll_at")
+        try:
+            due[feed_url] = min(datetime.fromisoformat(next_poll_at).timestamp(), now + max_interval)
+        except (TypeError, ValueError):
+            due[feed_url] = now
+    return due
+
+
+def watch_feeds(
+    args: argparse.Namespace,
+    feeds: list[str],
+    pool: ConnectionPool,
+    out_dir: Path,
+    state_path: Path,
+    state: dict[str, Any],
+    seen_ids: SeenStore,
+    metrics: RunMetrics,
+) -> int:
+    bounds = (args.watch_min_interval * 60.0, args.watch_default_interval * 60.0, args.watch_max_interval * 60.0)
+    retain_seconds = args.watch_retain_hours * 3600.0
+    due_at = initial_due_times(state, feeds, time.time(), bounds[2])
+    retained: deque[tuple[float, dict[str, Any]]] = deque()
+    feed_errors: dict[str, dict[str, Any]] = {}
+    breaker = build_breaker(args, feeds, state_path)
+    body_cache = build_body_cache(args)
+    # One parse pool for the whole watch, instead of respawning workers each tick.
+    parse_pool = open_parse_pool(args.parse_workers) if args.parse_workers > 0 else None
+    cycles = 0
+
+    stop = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: stop.set())
+
+    try:
+        while not stop.is_set():
+            now = time.time()
+            due = [feed_url for feed_url in feeds if due_at[feed_url] <= now + WATCH_COALESCE_SECONDS]
+            if due:
+                tick = {"tick_at": now_iso(), "polled": len(due), "not_modified": 0, "body_unchanged": 0, "new_items": 0, "errors": 0}
+                tick_items: list[dict[str, Any]] = []
+                tick_errors: list[dict[str, Any]] = []
+                feed_rows: list[dict[str, Any]] = []
+                with metrics.stage("fetch_and_parse"):
+                    fetch_run = FetchRun(
+                        due, since_cutoff(args), seen_ids, state, FetchOptions.from_args(args), pool, breaker, body_cache, parse_pool
+                    )
+                    for result in fetch_run.results():
+                        due_at[result.feed_url] = schedule_feed(state, result, bounds, time.time())
+                        feed_rows.append(feed_row(result))
+                        metrics.add_feed(result.metrics)
+                        tick_items.extend(result.items)
+                        retained.extend((now, item) for item in result.items)
+                        tick["new_items"] += len(result.items)
+                        tick["not_modified"] += int(result.not_modified)
+                        tick["body_unchanged"] += int(result.body_digest == "unchanged")
+                        if result.error is not None:
+                            feed_errors[result.feed_url] = result.error
+                            tick_errors.append(result.error)
+                            tick["errors"] += 1
+                        else:
+                            feed_errors.pop(result.feed_url, None)
+
+                while retained and retained[0][0] < now - retain_seconds:
+                    retained.popleft()
+                with metrics.stage("save_seen"):
+                    seen_ids.save(state)
+                    if args.seen_ttl_days is not None:
+                        seen_ids.evict_older_than(args.seen_ttl_days)
+                errors = [feed_errors[feed_url] for feed_url in feeds if feed_url in feed_errors]
+                with metrics.stage("write_outputs"):
+                    write_outputs(out_dir, state_path, state, [item for _, item in retained], errors, args.format)
+
+                cycles += 1
+                if args.runs_root:
+                    # Output files hold a rolling window, so each tick is indexed as its own run.
+                    run_id = f"{run_id_for(Path(args.runs_root), out_dir)}/tick-{cycles:06d}"
+                    with metrics.stage("index"):
+                        index_run(Path(args.runs_root), run_id, out_dir, tick["tick_at"], feed_rows, tick_items, tick_errors)
+                # metrics.json describes the latest tick.
+                write_metrics(args, out_dir, metrics, pool)
+                metrics = RunMetrics()
+                tick["retained_items"] = len(retained)
+                tick["next_poll_in_seconds"] = round(max(min(due_at.values()) - time.time(), 0.0), 1)
+                print(json.dumps(tick), flush=True)
+                if args.watch_max_cycles is not None and cycles >= args.watch_max_cycles:
+                    break
+                # Each tick is a fresh "run" for the breaker; the failure
+                # backoff above already spaces out unreachable feeds.
+                breaker = HostCircuitBreaker(args.breaker_threshold)
+
+            stop.wait(min(max(min(due_at.values()) - time.time() - WATCH_COALESCE_SECONDS, 0.0), WATCH_MAX_SLEEP_SECONDS))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+    summary = {
+        "feeds": len(feeds),
+        "cycles": cycles,
+        "retained_items": len(retained),
+        "errors": len(feed_errors),
+        "connections": pool.stats(),
+    }
+    print(json.dumps(summary, indent=2))
+    return 2 if feed_errors else 0
 
 
 def main() -> int:
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Queryable sqlite index of rss-fetch run history under --runs-root."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from json_records import iter_records
+
+INDEX_NAME = "index.sqlite"
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "run_id TEXT PRIMARY KEY, out_dir TEXT NOT NULL, started_at TEXT, finished_at TEXT, "
+    "feeds INTEGER NOT NULL, new_items INTEGER NOT NULL, errors INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS feeds ("
+    "run_id TEXT NOT NULL, feed_url TEXT NOT NULL, status TEXT NOT NULL, new_items INTEGER NOT NULL, "
+    "PRIMARY KEY (run_id, feed_url)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS items ("
+    "run_id TEXT NOT NULL, id TEXT NOT NULL, feed_url TEXT NOT NULL, title TEXT, url TEXT, published_at TEXT, "
+    "summary TEXT, word_count INTEGER, source_site TEXT, source_title TEXT, "
+    "PRIMARY KEY (run_id, id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS errors ("
+    "run_id TEXT NOT NULL, feed_url TEXT NOT NULL, stage TEXT, error TEXT, attempts INTEGER, "
+    "status_code INTEGER, timestamp TEXT)",
+    "CREATE INDEX IF NOT EXISTS feeds_feed_url ON feeds(feed_url)",
+    "CREATE INDEX IF NOT EXISTS items_id ON items(id)",
+    "CREATE INDEX IF NOT EXISTS items_published_at ON items(published_at)",
+    "CREATE INDEX IF NOT EXISTS items_feed_url_published_at ON items(feed_url, published_at)",
+    "CREATE INDEX IF NOT EXISTS errors_run_id ON errors(run_id)",
+    "CREATE INDEX IF NOT EXISTS errors_feed_url_timestamp ON errors(feed_url, timestamp)",
+)
+ITEM_COLUMNS = ("run_id", "id", "feed_url", "title", "url", "published_at", "summary", "word_count", "source_site", "source_title")
+ERROR_COLUMNS = ("run_id", "feed_url", "stage", "error", "attempts", "status_code", "timestamp")
+
+
+class RunIndex:
+    """One row per run, per-run feed outcome, emitted item and feed error.
+
+    Recording a run replaces any rows already stored under its run_id, so
+    re-indexing a run folder is idempotent.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def record_run(
+        self,
+        run_id: str,
+        out_dir: Path,
+        started_at: str | None,
+        finished_at: str | None,
+        feeds: list[dict[str, Any]],
+        items: Iterable[dict[str, Any]],
+        errors: list[dict[str, Any]],
+    ) -> None:
+        with self._conn:
+            for table in ("runs", "feeds", "items", "errors"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            cur = self._conn.executemany(
+                f"INSERT OR REPLACE INTO items ({', '.join(ITEM_COLUMNS)}) VALUES ({', '.join('?' * len(ITEM_COLUMNS))})",
+                (item_row(run_id, item) for item in items),
+            )
+            new_items = cur.rowcount
+            self._conn.executemany(
+                f"INSERT INTO errors ({', '.join(ERROR_COLUMNS)}) VALUES ({', '.join('?' * len(ERROR_COLUMNS))})",
+                ((run_id, *(err.get(col) for col in ERROR_COLUMNS[1:])) for err in errors),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO feeds (run_id, feed_url, status, new_items) VALUES (?, ?, ?, ?)",
+                ((run_id, feed["feed_url"], feed["status"], feed["new_items"]) for feed in feeds),
+            )
+            self._conn.execute(
+                "INSERT INTO runs (run_id, out_dir, started_at, finished_at, feeds, new_items, errors) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, str(out_dir), started_at, finished_at, len(feeds), new_items, len(errors)),
+            )
+
+    def query_items(
+        self,
+        feed_url: str | None = None,
+        item_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        clauses, params = where_clauses(feed_url=feed_url, id=item_id)
+        if since:
+            clauses.append("published_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("published_at < ?")
+            params.append(until)
+        sql = f"SELECT * FROM items{where_sql(clauses)} ORDER BY published_at DESC, run_id DESC LIMIT ?"
+        return [dict(row) for row in self._conn.execute(sql, (*params, limit))]
+
+    def query_errors(self, feed_url: str | None = None, since: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        clauses, params = where_clauses(feed_url=feed_url)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        sql = f"SELECT * FROM errors{where_sql(clauses)} ORDER BY timestamp DESC LIMIT ?"
+        return [dict(row) for row in self._conn.execute(sql, (*params, limit))]
+
+    def query_runs(self, limit: int = 20) -> list[dict[str, Any]]:
+        sql = "SELECT * FROM runs ORDER BY run_id DESC LIMIT ?"
+        return [dict(row) for row in self._conn.execute(sql, (limit,))]
+
+    def query_feeds(self, feed_url: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        clauses, params = where_clauses(feed_url=feed_url)
+        sql = f"SELECT * FROM feeds{where_sql(clauses)} ORDER BY run_id DESC LIMIT ?"
+        return [dict(row) for row in self._conn.execute(sql, (*params, limit))]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def where_clauses(**equals: str | None) -> tuple[list[str], list[Any]]:
+    clauses = [f"{column} = ?" for column, value in equals.items() if value is not None]
+    return clauses, [value for value in equals.values() if value is not None]
+
+
+def where_sql(clauses: list[str]) -> str:
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def item_row(run_id: str, item: dict[str, Any]) -> tuple[Any, ...]:
+    source = item.get("source") or {}
+    return (
+        run_id,
+        item.get("id"),
+        source.get("feed_url") or "",
+        item.get("title"),
+        item.get("url"),
+        item.get("published_at"),
+        item.get("summary"),
+        item.get("word_count"),
+        source.get("site"),
+        source.get("title"),
+    )
+
+
+def run_id_for(runs_root: Path, out_dir: Path) -> str:
+    try:
+        return out_dir.resolve().relative_to(runs_root.resolve()).as_posix()
+    except ValueError:
+        return out_dir.as_posix()
+
+
+def index_run_dir(index: RunIndex, runs_root: Path, run_dir: Path) -> None:
+    # Rebuild path: feed outcomes are recovered from items and errors only, so
+    # feeds that neither emitted items nor failed are not listed for old runs.
+    items = list(iter_records(run_dir / "items.json"))
+    errors = list(iter_records(run_dir / "errors.json"))
+    counts: dict[str, int] = {}
+    for item in items:
+        feed_url = (item.get("source") or {}).get("feed_url") or ""
+        counts[feed_url] = counts.get(feed_url, 0) + 1
+    feeds = [{"feed_url": url, "status": "ok", "new_items": n} for url, n in counts.items()]
+    feeds.extend({"feed_url": err.get("feed_url") or "", "status": "error", "new_items": 0} for err in errors)
+
+    run_id = run_id_for(runs_root, run_dir)
+    index.record_run(run_id, run_dir, run_started_at(run_id), None, feeds, items, errors)
+
+
+def run_started_at(run_id: str) -> str | None:
+    # Run folders are named <YYYY-MM-DD>/<HHMMSSZ>.
+    try:
+        return datetime.strptime(run_id[:17], "%Y-%m-%d/%H%M%SZ").replace(tzinfo=timezone.utc).isoformat()
+    except ValueError:
+        return None
+
+
+def rebuild(index: RunIndex, runs_root: Path) -> int:
+    run_dirs = sorted(path.parent for path in runs_root.glob("*/*/items.json"))
+    for run_dir in run_dirs:
+        index_run_dir(index, runs_root, run_dir)
+    return len(run_dirs)
+
+
+def since_days(days: float | None) -> str | None:
+    if days is None:
+        return None
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query or rebuild the rss-fetch run-history index")
+    parser.add_argument("--runs-root", default=None, help="rss_fetch.py --runs-root folder (index at <runs-root>/index.sqlite)")
+    parser.add_argument("--index", default=None, help="Explicit path to the index database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    items = sub.add_parser("items", help="Items by feed, ID and/or published_at window, newest first")
+    items.add_argument("--feed", default=None, help="Exact feed URL")
+    items.add_argument("--id", default=None, help="Item ID")
+    items.add_argument("--days", type=float, default=None, help="Only items published within the last N days")
+    items.add_argument("--since", default=None, help="Only items published at or after this ISO8601 UTC time")
+    items.add_argument("--until", default=None, help="Only items published before this ISO8601 UTC time")
+    items.add_argument("--limit", type=int, default=100, help="Max rows")
+
+    errors = sub.add_parser("errors", help="Feed errors, newest first")
+    errors.add_argument("--feed", default=None, help="Exact feed URL")
+    errors.add_argument("--days", type=float, default=None, help="Only errors within the last N days")
+    errors.add_argument("--limit", type=int, default=100, help="Max rows")
+
+    feeds = sub.add_parser("feeds", help="Per-run feed outcomes, newest run first")
+    feeds.add_argument("--feed", default=None, help="Exact feed URL")
+    feeds.add_argument("--limit", type=int, default=100, help="Max rows")
+
+    runs = sub.add_parser("runs", help="Indexed runs, newest first")
+    runs.add_argument("--limit", type=int, default=20, help="Max rows")
+
+    sub.add_parser("rebuild", help="Re-index every <YYYY-MM-DD>/<HHMMSSZ> folder under --runs-root")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args(sys.argv[1:])
+    if args.index:
+        index_path = Path(args.index)
+    elif args.runs_root:
+        index_path = Path(args.runs_root) / INDEX_NAME
+    else:
+        sys.stderr.write("input error: provide --runs-root or --index\n")
+        return 1
+    if args.command == "rebuild" and not args.runs_root:
+        sys.stderr.write("input error: rebuild requires --runs-root\n")
+        return 1
+    if args.command != "rebuild" and not index_path.exists():
+        sys.stderr.write(f"input error: index not found: {index_path}\n")
+        return 1
+
+    index = RunIndex(index_path)
+    try:
+        if args.command == "items":
+            result: Any = index.query_items(args.feed, args.id, args.since or since_days(args.days), args.until, args.limit)
+        elif args.command == "errors":
+            result = index.query_errors(args.feed, since_days(args.days), args.limit)
+        elif args.command == "feeds":
+            result = index.query_feeds(args.feed, args.limit)
+        elif args.command == "runs":
+            result = index.query_runs(args.limit)
+        else:
+            result = {"index": str(index_path), "runs_indexed": rebuild(index, Path(args.runs_root))}
+    finally:
+        index.close()
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Per-run and per-feed metrics for rss-fetch (metrics.json and Prometheus textfile)."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+
+# Per-feed numeric fields summed into run totals.
+FEED_TOTALS = (
+    "fetch_seconds",
+    "bytes",
+    "wire_bytes",
+    "attempts",
+    "parse_seconds",
+    "normalize_seconds",
+    "entries_parsed",
+    "items_kept",
+    "items_deduped",
+    "items_too_old",
+)
+# Per-feed fields exported to Prometheus as rss_fetch_feed_<name>.
+PROM_FEED_GAUGES = (
+    ("fetch_seconds", "Time spent in fetch attempts"),
+    ("elapsed_seconds", "Wall time from first attempt to final outcome, including retry waits"),
+    ("bytes", "Response body bytes after decompression"),
+    ("wire_bytes", "Response body bytes received before decompression"),
+    ("attempts", "Fetch attempts"),
+    ("parse_seconds", "Streaming parse and dedupe checks"),
+    ("normalize_seconds", "HTML stripping and item building"),
+    ("entries_parsed", "Entries streamed from the feed"),
+    ("items_kept", "New items emitted"),
+    ("items_deduped", "Entries skipped as already seen"),
+    ("items_too_old", "Entries skipped as older than --since-hours"),
+)
+
+
+class RunMetrics:
+    """Collects stage timings and per-feed rows; only perf_counter calls and dict appends while running."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.feeds: list[dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def add_feed(self, row: dict[str, Any]) -> None:
+        self.feeds.append(row)
+
+    def body_digest(self) -> dict[str, Any]:
+        # Digest hits among feeds that returned a body (errors and 304s excluded).
+        unchanged = sum(1 for row in self.feeds if row.get("body_digest") == "unchanged")
+        changed = sum(1 for row in self.feeds if row.get("body_digest") == "changed")
+        compared = unchanged + changed
+        return {"unchanged": unchanged, "changed": changed, "hit_rate": round(unchanged / compared, 4) if compared else None}
+
+    def report(self, connections: dict[str, int]) -> dict[str, Any]:
+        totals: dict[str, Any] = {name: 0 for name in FEED_TOTALS}
+        statuses = {"ok": 0, "not_modified": 0, "error": 0}
+        for row in self.feeds:
+            for name in FEED_TOTALS:
+                totals[name] += row[name]
+            statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+        for name in ("fetch_seconds", "parse_seconds", "normalize_seconds"):
+            totals[name] = round(totals[name], 6)
+
+        # Slowest feeds first so the ones dominating run time are at the top.
+        feeds = sorted(self.feeds, key=lambda row: row["elapsed_seconds"], reverse=True)
+        return {
+            "started_at": self.started_at.isoformat(),
+            "run_seconds": round(time.perf_counter() - self._start, 6),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "totals": {"feeds": len(self.feeds), **statuses, **totals},
+            "body_digest": self.body_digest(),
+            "connections": connections,
+            "feeds": feeds,
+        }
+
+
+def prometheus_text(report: dict[str, Any]) -> str:
+    # Text exposition format for node_exporter's textfile collector.
+    lines: list[str] = []
+
+    def gauge(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    started = datetime.fromisoformat(report["started_at"]).timestamp()
+    gauge("rss_fetch_last_run_timestamp_seconds", "Start time of the last run", [({}, started)])
+    gauge("rss_fetch_run_duration_seconds", "Whole-run wall time", [({}, report["run_seconds"])])
+    gauge("rss_fetch_stage_seconds", "Wall time per run stage", [({"stage": name}, value) for name, value in report["stages"].items()])
+    totals = report["totals"]
+    gauge("rss_fetch_run_feeds", "Feeds by outcome", [({"status": status}, totals[status]) for status in ("ok", "not_modified", "error")])
+    gauge("rss_fetch_run_items", "Entries by disposition", [({"kind": kind}, totals[f"items_{kind}"]) for kind in ("kept", "deduped", "too_old")])
+    gauge("rss_fetch_run_bytes", "Response body bytes across feeds", [({"encoding": "decoded"}, totals["bytes"]), ({"encoding": "wire"}, totals["wire_bytes"])])
+    digest = report["body_digest"]
+    gauge("rss_fetch_body_digest_feeds", "Feeds whose body matched or differed from the last parse", [({"result": name}, digest[name]) for name in ("unchanged", "changed")])
+    gauge("rss_fetch_connections", "Connection pool counters", [({"counter": name}, value) for name, value in report["connections"].items()])
+    gauge("rss_fetch_feed_up", "1 if the feed succeeded (including 304)", [({"feed": row["feed_url"]}, int(row["status"] != "error")) for row in report["feeds"]])
+    for field, help_text in PROM_FEED_GAUGES:
+        gauge(f"rss_fetch_feed_{field}", help_text, [({"feed": row["feed_url"]}, row[field]) for row in report["feeds"]])
+    return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
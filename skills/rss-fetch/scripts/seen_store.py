@@ -0,0 +1,135 @@
+"""Dedupe stores for item IDs already emitted by rss-fetch."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+SECONDS_PER_DAY = 86400
+
+
+class JsonSeenStore:
+    """Legacy store: the full ID list lives in ``state["seen_ids"]`` and is rewritten sorted on save."""
+
+    backend = "json"
+
+    def __init__(self, state: dict[str, Any]) -> None:
+        self._state = state
+        self._ids = set(str(x) for x in state.get("seen_ids", []))
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, item_id: str) -> None:
+        self._ids.add(item_id)
+
+    def evict_older_than(self, days: float) -> int:
+        raise ValueError("the json seen store keeps no timestamps; use the sqlite backend for TTL eviction")
+
+    def save(self, state: dict[str, Any]) -> None:
+        state["seen_ids"] = sorted(self._ids)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteSeenStore:
+    """Indexed on-disk store; only IDs added or re-sighted during a run are written.
+
+    Membership hits refresh ``last_seen`` so TTL eviction drops only IDs that no
+    feed has carried for the whole TTL.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_ids ("
+            "id TEXT PRIMARY KEY, first_seen REAL NOT NULL, last_seen REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_ids_last_seen ON seen_ids(last_seen)")
+        self._conn.commit()
+        self._added: set[str] = set()
+        self._hits: set[str] = set()
+
+    def __contains__(self, item_id: object) -> bool:
+        if item_id in self._added:
+            return True
+        row = self._conn.execute("SELECT 1 FROM seen_ids WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return False
+        self._hits.add(str(item_id))
+        return True
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM seen_ids").fetchone()
+        return int(count) + len(self._added)
+
+    def add(self, item_id: str) -> None:
+        self._added.add(item_id)
+
+    def import_ids(self, ids: Iterable[Any]) -> int:
+        now = time.time()
+        before = self._conn.total_changes
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_ids (id, first_seen, last_seen) VALUES (?, ?, ?)",
+                ((str(x), now, now) for x in ids),
+            )
+        return self._conn.total_changes - before
+
+    def import_store(self, path: Path) -> int:
+        # Union another sqlite store into this one, keeping each ID's earliest
+        # first_seen and latest last_seen (used to merge per-shard stores).
+        before = self._conn.total_changes
+        self._conn.execute("ATTACH DATABASE ? AS other", (str(path),))
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO seen_ids (id, first_seen, last_seen) "
+                    "SELECT id, first_seen, last_seen FROM other.seen_ids WHERE true "
+                    "ON CONFLICT(id) DO UPDATE SET "
+                    "first_seen = min(first_seen, excluded.first_seen), last_seen = max(last_seen, excluded.last_seen)"
+                )
+        finally:
+            self._conn.execute("DETACH DATABASE other")
+        return self._conn.total_changes - before
+
+    def evict_older_than(self, days: float) -> int:
+        cutoff = time.time() - days * SECONDS_PER_DAY
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM seen_ids WHERE last_seen < ?", (cutoff,))
+        return cur.rowcount
+
+    def save(self, state: dict[str, Any]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_ids (id, first_seen, last_seen) VALUES (?, ?, ?)",
+                ((item_id, now, now) for item_id in sorted(self._added)),
+            )
+            self._conn.executemany(
+                "UPDATE seen_ids SET last_seen = ? WHERE id = ?",
+                ((now, item_id) for item_id in sorted(self._hits)),
+            )
+        self._added.clear()
+        self._hits.clear()
+        state.pop("seen_ids", None)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+SeenStore = JsonSeenStore | SqliteSeenStore
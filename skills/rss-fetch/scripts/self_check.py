@@ -3,15 +3,27 @@
 
 from __future__ import annotations
 
+import gzip
+import io
 import json
+import socket
+import sqlite3
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 FETCH_SCRIPT = ROOT / "scripts" / "rss_fetch.py"
 FIXTURES = ROOT / "tests" / "fixtures"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import json_records  # noqa: E402
+import rss_fetch  # noqa: E402
 
 REQUIRED_ITEM_KEYS = {"id", "title", "url", "published_at", "summary", "word_count", "source"}
 REQUIRED_SOURCE_KEYS = {"feed_url", "site", "title"}
@@ -22,7 +34,7 @@ def assert_true(condition: bool, message: str) -> None:
         raise AssertionError(message)
 
 
-def run_fetch(feeds_file: Path, out_dir: Path, state_file: Path) -> subprocess.CompletedProcess[str]:
+def run_fetch(feeds_file: Path, out_dir: Path, state_file: Path, *extra: str) -> subprocess.CompletedProcess[str]:
     cmd = [
         sys.executable,
         str(FETCH_SCRIPT),
@@ -36,6 +48,7 @@ def run_fetch(feeds_file: Path, out_dir: Path, state_file: Path) -> subprocess.C
         "10",
         "--timeout",
         "2",
+        *extra,
     ]
     return subprocess.run(cmd, capture_output=True, text=True, check=False)
 
@@ -44,6 +57,144 @@ def load_json(path: Path):
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+class FeedHandler(BaseHTTPRequestHandler):
+    # Serves FeedServer.routes; a route's "etag" makes a matching If-None-Match a 304.
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        route = server.routes.get(self.path)
+        if route is None:
+            self.send_error(404)
+            return
+        time.sleep(route.get("delay", 0))
+        etag = route.get("etag")
+        status = 304 if etag and self.headers.get("If-None-Match") == etag else 200
+        if status == 304:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(route["body"])))
+            if etag:
+                self.send_header("ETag", etag)
+            if route.get("last_modified"):
+                self.send_header("Last-Modified", route["last_modified"])
+            self.end_headers()
+            self.wfile.write(route["body"])
+        server.completed.append((self.path, status))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Local HTTP feed host that records every request's headers and each response's path and status, in completion order."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FeedHandler)
+        self.routes: dict[str, dict[str, Any]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.completed: list[tuple[str, int]] = []
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+def seen_rows(path: Path) -> list[tuple]:
+    store = sqlite3.connect(str(path))
+    try:
+        return sorted(store.execute("SELECT * FROM seen_ids"))
+    finally:
+        store.close()
+
+
+def check_http(tmp_dir: Path, rss_file: Path, atom_file: Path) -> None:
+    server = FeedServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # Conditional GET: validators from state are sent, a 304 emits nothing
+        # and leaves seen IDs alone, and a 200 stores the new validators.
+        cond_url = server.url("/cond.xml")
+        server.routes["/cond.xml"] = {"body": rss_file.read_bytes(), "etag": '"v1"', "last_modified": "Mon, 01 Jun 2026 00:00:00 GMT"}
+        cond_dir = tmp_dir / "conditional"
+        cond_dir.mkdir()
+        cond_feeds = cond_dir / "feeds.txt"
+        cond_feeds.write_text(cond_url + "\n", encoding="utf-8")
+        cond_state = cond_dir / "state.json"
+
+        def cond_fetch() -> tuple[dict[str, str], list[dict[str, Any]], dict[str, Any]]:
+            server.requests.clear()
+            run = run_fetch(cond_feeds, cond_dir, cond_state, "--skip-network-check")
+            assert_true(run.returncode == 0, f"Expected exit 0 from the conditional GET run, got {run.returncode}: {run.stderr}")
+            assert_true(len(server.requests) == 1, f"Expected one request per run: {server.requests}")
+            return server.requests[0][1], load_json(cond_dir / "items.json"), load_json(cond_state)["feeds"][cond_url]
+
+        headers, cond_items, meta = cond_fetch()
+        assert_true("If-None-Match" not in headers and "If-Modified-Since" not in headers, f"First fetch should be unconditional: {headers}")
+        assert_true(len(cond_items) >= 1, "First conditional GET run should emit items")
+        assert_true((meta["etag"], meta["last_modified"]) == ('"v1"', "Mon, 01 Jun 2026 00:00:00 GMT"), f"Validators not stored: {meta}")
+        seen_before = seen_rows(cond_state.with_suffix(".seen.sqlite"))
+
+        headers, cond_items, meta = cond_fetch()
+        assert_true(headers.get("If-None-Match") == '"v1"', f"Stored ETag should be sent as If-None-Match: {headers}")
+        assert_true(headers.get("If-Modified-Since") == "Mon, 01 Jun 2026 00:00:00 GMT", f"Stored Last-Modified should be sent: {headers}")
+        assert_true(server.completed[-1] == ("/cond.xml", 304) and cond_items == [], "A 304 should emit no items")
+        assert_true(seen_rows(cond_state.with_suffix(".seen.sqlite")) == seen_before, "A 304 should leave the seen store unchanged")
+        assert_true(meta["etag"] == '"v1"', f"A 304 should keep the stored validators: {meta}")
+
+        server.routes["/cond.xml"] = {"body": atom_file.read_bytes(), "etag": '"v2"', "last_modified": "Tue, 02 Jun 2026 00:00:00 GMT"}
+        headers, cond_items, meta = cond_fetch()
+        assert_true(headers.get("If-None-Match") == '"v1"', f"Stale ETag should still be sent: {headers}")
+        assert_true(len(cond_items) >= 1, "A 200 with a new body should emit its items")
+        assert_true((meta["etag"], meta["last_modified"]) == ('"v2"', "Tue, 02 Jun 2026 00:00:00 GMT"), f"A 200 should update validators: {meta}")
+
+        # Concurrent fetch: the slow first feed completes last, but output keeps
+        # feed-list order and matches a sequential run.
+        server.routes["/slow.xml"] = {"body": atom_file.read_bytes(), "delay": 0.6}
+        server.routes["/fast.xml"] = {"body": rss_file.read_bytes()}
+        order_feeds = tmp_dir / "order-feeds.txt"
+        order_feeds.write_text(f"{server.url('/slow.xml')}\n{server.url('/fast.xml')}\n", encoding="utf-8")
+        ordered = {}
+        for workers in ("1", "2"):
+            order_dir = tmp_dir / f"order-{workers}"
+            server.completed.clear()
+            run = run_fetch(order_feeds, order_dir, order_dir / "state.json", "--skip-network-check", "--concurrency", workers)
+            assert_true(run.returncode == 0, f"Expected exit 0 from the --concurrency {workers} run, got {run.returncode}: {run.stderr}")
+            ordered[workers] = (list(server.completed), load_json(order_dir / "items.json"))
+        completed, concurrent_items = ordered["2"]
+        assert_true(completed == [("/fast.xml", 200), ("/slow.xml", 200)], f"The fast feed should complete first: {completed}")
+        feed_order = [item["source"]["feed_url"] for item in concurrent_items]
+        assert_true(feed_order == sorted(feed_order, key=lambda url: not url.endswith("/slow.xml")), f"Items should follow feed-list order: {feed_order}")
+        assert_true(len(set(feed_order)) == 2, f"Both feeds should emit items: {feed_order}")
+        assert_true(concurrent_items == ordered["1"][1], "--concurrency 2 should emit the same items in the same order as a sequential run")
+
+        # Circuit breaker: once a host reaches --breaker-threshold connection
+        # failures, its remaining feeds are skipped; other hosts still fetch.
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            dead_port = probe.getsockname()[1]
+        dead_urls = [f"http://127.0.0.1:{dead_port}/feed{i}.xml" for i in range(4)]
+        breaker_dir = tmp_dir / "breaker"
+        breaker_feeds = tmp_dir / "breaker-feeds.txt"
+        breaker_feeds.write_text("\n".join([*dead_urls, server.url("/fast.xml")]) + "\n", encoding="utf-8")
+        run = run_fetch(breaker_feeds, breaker_dir, breaker_dir / "state.json", "--skip-network-check", "--breaker-threshold", "2")
+        assert_true(run.returncode == 2, f"Expected exit 2 with an unreachable host, got {run.returncode}: {run.stderr}")
+        assert_true(json.loads(run.stdout)["circuit_open_hosts"] == [f"127.0.0.1:{dead_port}"], f"Breaker should open for the dead host: {run.stdout}")
+        breaker_errors = load_json(breaker_dir / "errors.json")
+        assert_true([err["feed_url"] for err in breaker_errors] == dead_urls, f"Every feed on the dead host should fail: {breaker_errors}")
+        skipped = [err for err in breaker_errors if err["attempts"] == 0]
+        assert_true(len(skipped) == len(dead_urls) - 2, f"Feeds after the threshold should be skipped without a request: {breaker_errors}")
+        assert_true(all("Circuit open" in err["error"] for err in skipped), f"Skipped feeds should name the open circuit: {skipped}")
+        assert_true(len(load_json(breaker_dir / "items.json")) >= 1, "Feeds on other hosts should still emit items")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 def main() -> int:
     rss_file = (FIXTURES / "sample_rss.xml").resolve()
     atom_file = (FIXTURES / "sample_atom.xml").resolve()
@@ -96,6 +247,8 @@ def main() -> int:
 
         second = run_fetch(feeds_file, out_dir, state_file)
         assert_true(second.returncode == 2, f"Expected exit 2 on second run, got {second.returncode}")
+        body_digest = json.loads(second.stdout)["body_digest"]
+        assert_true(body_digest["unchanged"] == 2 and body_digest["changed"] == 0, f"Unchanged fixture bodies should skip parsing: {body_digest}")
 
         second_items = load_json(items_path)
         second_digest = digest_path.read_text(encoding="utf-8")
@@ -103,6 +256,97 @@ def main() -> int:
         assert_true(second_items == [], "Dedupe failed: second run should emit zero new items")
         assert_true("No new items." in second_digest, "Digest should indicate no new items")
 
+        legacy_dir = tmp_dir / "legacy"
+        legacy_state = legacy_dir / "state.json"
+        legacy_dir.mkdir()
+        legacy_state.write_text(json.dumps({"version": 1, "seen_ids": [item["id"] for item in items], "feeds": {}}), encoding="utf-8")
+        migrated = run_fetch(feeds_file, legacy_dir, legacy_state)
+        assert_true(migrated.returncode == 2, f"Expected exit 2 on migration run, got {migrated.returncode}")
+        assert_true(load_json(legacy_dir / "items.json") == [], "Migrated seen_ids should dedupe all fixture items")
+        assert_true("seen_ids" not in load_json(legacy_state), "seen_ids should move out of state.json after migration")
+        assert_true(legacy_state.with_suffix(".seen.sqlite").exists(), "sqlite seen store not created")
+
+        ndjson_dir = tmp_dir / "ndjson"
+        streamed = run_fetch(feeds_file, ndjson_dir, ndjson_dir / "state.json", "--format", "ndjson")
+        assert_true(streamed.returncode == 2, f"Expected exit 2 on ndjson run, got {streamed.returncode}")
+        ndjson_items = [json.loads(line) for line in (ndjson_dir / "items.json").read_text(encoding="utf-8").splitlines()]
+        assert_true(ndjson_items == items, "NDJSON items should match the JSON array run")
+        ndjson_digest = (ndjson_dir / "digest.md").read_text(encoding="utf-8")
+        assert_true(all(f"## {item['title']}" in ndjson_digest for item in items), "NDJSON digest missing item sections")
+
+        healthy_dir = tmp_dir / "healthy"
+        healthy_dir.mkdir()
+        (healthy_dir / "errors.json").write_text("", encoding="utf-8")
+        health_cmd = [sys.executable, str(ROOT / "scripts" / "feed_health.py"), "--feeds", str(feeds_file)]
+        for flag, name in (("--quarantine", "quarantine.txt"), ("--errors", "errors.json"), ("--state", "state.json"), ("--health-state", "health.json"), ("--report", "report.json")):
+            health_cmd += [flag, str(healthy_dir / name)]
+        health = subprocess.run(health_cmd, capture_output=True, text=True, check=False)
+        assert_true(health.returncode == 0, f"feed_health should accept an empty NDJSON errors.json: {health.stderr}")
+        assert_true(list(json_records.iter_stream_records(io.StringIO(" \n"))) == [], "Whitespace-only records input should hold no records")
+        assert_true(list(json_records.iter_records(ndjson_dir / "items.json")) == items, "Shared reader should read NDJSON items")
+        assert_true(list(json_records.iter_records(items_path.with_name("missing.json"))) == [], "A missing records file should hold no records")
+
+        pooled_dir = tmp_dir / "pooled"
+        pooled = run_fetch(feeds_file, pooled_dir, pooled_dir / "state.json", "--parse-workers", "2")
+        assert_true(pooled.returncode == 2, f"Expected exit 2 with parse workers, got {pooled.returncode}")
+        assert_true(load_json(pooled_dir / "items.json") == items, "Parse workers should emit the same items as in-process parsing")
+        # A corrupt body_parsed_at fails only its own feed, with or without parse workers.
+        pooled_state = load_json(pooled_dir / "state.json")
+        pooled_state["feeds"][rss_file.as_uri()]["body_parsed_at"] = "not-a-date"
+        corrupt_errors = []
+        for workers in ("0", "2"):
+            corrupt_dir = tmp_dir / f"corrupt-{workers}"
+            corrupt_dir.mkdir()
+            (corrupt_dir / "state.json").write_text(json.dumps(pooled_state), encoding="utf-8")
+            corrupt = run_fetch(feeds_file, corrupt_dir, corrupt_dir / "state.json", "--parse-workers", workers)
+            assert_true(corrupt.returncode == 2, f"Corrupt feed state should fail one feed, not the run: {corrupt.returncode} {corrupt.stderr}")
+            corrupt_errors.append(sorted((err["feed_url"], err["stage"]) for err in load_json(corrupt_dir / "errors.json")))
+        assert_true(rss_file.as_uri() in {url for url, _ in corrupt_errors[0]}, f"Corrupt feed state should be that feed's error: {corrupt_errors[0]}")
+        assert_true(corrupt_errors[0] == corrupt_errors[1], f"Parse workers should isolate state errors like in-process parsing: {corrupt_errors}")
+
+        shard_dirs = [tmp_dir / "shards" / str(i) for i in (1, 2)]
+        for i, shard_dir in enumerate(shard_dirs, start=1):
+            # Shard 2 keeps its seen store outside its output dir.
+            store_args = ["--seen-store", str(tmp_dir / "stores" / "shard2.sqlite")] if i == 2 else []
+            run_fetch(feeds_file, shard_dir, shard_dir / "state.json", "--shard", f"{i}/2", *store_args)
+        merge_cmd = [sys.executable, str(ROOT / "scripts" / "shard_merge.py"), "--feeds", str(feeds_file), "--out-dir", str(tmp_dir / "merged")]
+        for shard_dir in reversed(shard_dirs):
+            merge_cmd += ["--shard-dir", str(shard_dir)]
+        merged = subprocess.run(merge_cmd, capture_output=True, text=True, check=False)
+        assert_true(merged.returncode == 2, f"Expected exit 2 from shard merge, got {merged.returncode}: {merged.stderr}")
+        assert_true(load_json(tmp_dir / "merged" / "items.json") == items, "Merged shards should match the unsharded items")
+        merged_store = sqlite3.connect(str(tmp_dir / "merged" / "state.seen.sqlite"))
+        merged_ids = {row[0] for row in merged_store.execute("SELECT id FROM seen_ids")}
+        merged_store.close()
+        assert_true(merged_ids == {item["id"] for item in items}, "Merged seen store should hold every shard's IDs")
+
+        watch_dir = tmp_dir / "watch"
+        watched = run_fetch(feeds_file, watch_dir, watch_dir / "state.json", "--watch", "--watch-max-cycles", "1")
+        assert_true(watched.returncode == 2, f"Expected exit 2 from one watch tick, got {watched.returncode}")
+        assert_true(len(load_json(watch_dir / "items.json")) == len(items), "Watch tick should flush the same new items")
+        watch_feeds = load_json(watch_dir / "state.json")["feeds"]
+        assert_true(all("next_poll_at" in meta for meta in watch_feeds.values()), "Watch mode should schedule every feed")
+
+        check_http(tmp_dir, rss_file, atom_file)
+
+        options = rss_fetch.FetchOptions(timeout=2, max_items_per_feed=10)
+        fetch_run = rss_fetch.fetch_items(feeds_file.read_text(encoding="utf-8").split(), options=options)
+        api_items = list(fetch_run)
+        assert_true(all(isinstance(item, rss_fetch.FeedItem) for item in api_items), "fetch_items should yield FeedItem objects")
+        assert_true([item.to_dict() for item in api_items] == items, "In-process items should match the CLI items.json")
+        assert_true([error.feed_url for error in fetch_run.errors] == [missing_file.as_uri()], "In-process run should isolate the missing feed")
+
+    bomb = gzip.compress(b"\0" * (rss_fetch.MAX_BYTES * 4))
+    try:
+        rss_fetch.read_decoded(io.BytesIO(bomb), rss_fetch.MAX_BYTES, "gzip")
+        raise AssertionError("A gzip body inflating past max bytes should fail")
+    except rss_fetch.FeedProcessingError as e:
+        assert_true(e.stage == "fetch" and "after decompression" in e.message, f"Unexpected gzip bomb error: {e.message}")
+    members = gzip.compress(b"<rss>first member ") + gzip.compress(b"second member</rss>")
+    decoded, wire_bytes = rss_fetch.read_decoded(io.BytesIO(members), rss_fetch.MAX_BYTES, "gzip")
+    assert_true(decoded == b"<rss>first member second member</rss>", f"Multi-member gzip should decode every member: {decoded!r}")
+    assert_true(wire_bytes == len(members), "Multi-member gzip should count every wire byte")
+
     print("self-check passed")
     return 0
 
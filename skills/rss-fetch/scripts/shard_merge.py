@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Merge per-shard rss_fetch.py outputs (--shard i/N) into one items/errors/digest/state set."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from json_records import iter_records  # noqa: E402
+from rss_fetch import FeedProcessingError, load_state, read_feeds_file, shard_of, write_outputs  # noqa: E402
+from seen_store import SqliteSeenStore  # noqa: E402
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Merge rss_fetch.py --shard outputs into one consistent result")
+    p.add_argument(
+        "--shard-dir",
+        action="append",
+        required=True,
+        help="Output directory of one shard run, holding items.json, errors.json and state.json (repeatable)",
+    )
+    p.add_argument("--out-dir", required=True, help="Directory for merged items.json, errors.json and digest.md")
+    p.add_argument("--state-file", default=None, help="Merged state.json path (default: <out-dir>/state.json)")
+    p.add_argument("--feeds", default=None, help="Feed list used by the shards; merged records follow its order")
+    p.add_argument("--format", choices=["json", "ndjson"], default="json", help="Layout of merged items.json/errors.json")
+    p.add_argument("--allow-partial", action="store_true", help="Merge even if some shards of N are missing")
+    return p.parse_args(argv)
+
+
+def load_shards(shard_dirs: list[Path], allow_partial: bool) -> tuple[int, list[tuple[int, Path, dict[str, Any]]]]:
+    shards: list[tuple[int, Path, dict[str, Any]]] = []
+    counts: set[int] = set()
+    for shard_dir in shard_dirs:
+        state_path = shard_dir / "state.json"
+        if not state_path.exists():
+            raise FeedProcessingError("input", f"Shard state not found: {state_path}")
+        state = load_state(state_path)
+        shard = state.get("shard")
+        if not isinstance(shard, dict):
+            raise FeedProcessingError("input", f"{state_path} was not written by a --shard run")
+        shards.append((int(shard["index"]), shard_dir, state))
+        counts.add(int(shard["count"]))
+
+    if len(counts) != 1:
+        raise FeedProcessingError("input", f"Shards disagree on N: {sorted(counts)}")
+    count = counts.pop()
+    indexes = [index for index, _, _ in shards]
+    duplicates = sorted({index for index in indexes if indexes.count(index) > 1})
+    if duplicates:
+        raise FeedProcessingError("input", f"Shard(s) given more than once: {duplicates}")
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    if missing and not allow_partial:
+        raise FeedProcessingError("input", f"Missing shard(s) {missing} of {count} (use --allow-partial to merge anyway)")
+    # Shard order, not command-line order, so the result is the same however workers are listed.
+    return count, sorted(shards, key=lambda shard: shard[0])
+
+
+def shard_seen_store(index: int, shard_dir: Path, state: dict[str, Any]) -> Path | None:
+    # The path the shard run recorded; if the outputs were copied elsewhere, a
+    # store of the same name inside the shard dir. Shards written before the
+    # path was recorded used <shard_dir>/state.seen.sqlite. json-backend shards
+    # keep their IDs in state.json (merged with the state) and have no store.
+    recorded = state["shard"].get("seen_store")
+    if recorded is None and "seen_ids" in state:
+        return None
+    candidates = [Path(recorded), shard_dir / Path(recorded).name] if recorded else [shard_dir / "state.seen.sqlite"]
+    for path in candidates:
+        if path.exists():
+            return path
+    raise FeedProcessingError(
+        "input", f"Seen store of shard {index} not found (looked for {', '.join(str(p) for p in candidates)})"
+    )
+
+
+def merge_state(count: int, shards: list[tuple[int, Path, dict[str, Any]]]) -> dict[str, Any]:
+    # A feed's metadata comes from the shard that owns it. Entries another shard
+    # only carries (e.g. after being seeded from an earlier merged state) fill
+    # gaps, first shard wins.
+    merged: dict[str, Any] = {"version": 1, "feeds": {}}
+    borrowed: dict[str, Any] = {}
+    seen_ids: set[str] = set()
+    has_seen_ids = False
+    for index, _, state in shards:
+        for feed_url, meta in state["feeds"].items():
+            if shard_of(feed_url, count) == index:
+                merged["feeds"][feed_url] = meta
+            else:
+                borrowed.setdefault(feed_url, meta)
+        if "seen_ids" in state:
+            has_seen_ids = True
+            seen_ids.update(str(x) for x in state["seen_ids"])
+    for feed_url, meta in borrowed.items():
+        merged["feeds"].setdefault(feed_url, meta)
+    merged["feeds"] = dict(sorted(merged["feeds"].items()))
+    if has_seen_ids:
+        merged["seen_ids"] = sorted(seen_ids)
+    return merged
+
+
+def merge_records(
+    shards: list[tuple[int, Path, dict[str, Any]]],
+    name: str,
+    feed_order: dict[str, int],
+    feed_url_of: Callable[[dict[str, Any]], str | None],
+    id_of: Callable[[dict[str, Any]], str | None] | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    records: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    duplicates = 0
+    for _, shard_dir, _ in shards:
+        for record in iter_records(shard_dir / name):
+            record_id = id_of(record) if id_of else None
+            if record_id is not None:
+                if record_id in seen:
+                    duplicates += 1
+                    continue
+                seen.add(record_id)
+            records.append(record)
+    if feed_order:
+        # Stable sort: per-feed order from the shard run is kept.
+        records.sort(key=lambda record: feed_order.get(feed_url_of(record), len(feed_order)))
+    return records, duplicates
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    count, shards = load_shards([Path(d) for d in args.shard_dir], args.allow_partial)
+    feed_order = {feed_url: i for i, feed_url in enumerate(read_feeds_file(Path(args.feeds)))} if args.feeds else {}
+
+    items, duplicates = merge_records(
+        shards,
+        "items.json",
+        feed_order,
+        lambda item: (item.get("source") or {}).get("feed_url"),
+        lambda item: item.get("id"),
+    )
+    errors, _ = merge_records(shards, "errors.json", feed_order, lambda error: error.get("feed_url"))
+    state = merge_state(count, shards)
+
+    out_dir = Path(args.out_dir)
+    state_path = Path(args.state_file) if args.state_file else out_dir / "state.json"
+    found = (shard_seen_store(index, shard_dir, shard_state) for index, shard_dir, shard_state in shards)
+    stores = [path for path in found if path is not None]
+    if stores:
+        merged_store = SqliteSeenStore(state_path.with_suffix(".seen.sqlite"))
+        try:
+            for store_path in stores:
+                merged_store.import_store(store_path)
+        finally:
+            merged_store.close()
+    write_outputs(out_dir, state_path, state, items, errors, args.format)
+
+    summary = {
+        "shards": [index for index, _, _ in shards],
+        "shard_count": count,
+        "feeds": len(state["feeds"]),
+        "items": len(items),
+        "duplicate_items": duplicates,
+        "errors": len(errors),
+        "seen_stores_merged": len(stores),
+    }
+    print(json.dumps(summary, indent=2))
+    return 2 if errors else 0
+
+
+def main() -> int:
+    try:
+        return run(sys.argv[1:])
+    except FeedProcessingError as e:
+        sys.stderr.write(f"{e.stage} error: {e.message}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Persistent term statistics over past signals, used to score how novel new signals are."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "rss-fetch" / "scripts"))
+
+from json_records import iter_stream_records  # noqa: E402
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its new of on or that the this to was were will with".split()
+)
+# BM25 term-frequency saturation and length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+# SQLite's default limit on bound parameters is 999 on older builds.
+LOOKUP_CHUNK = 900
+
+
+def tokenize(signal: dict[str, Any]) -> list[str]:
+    text = f"{signal.get('title') or ''} {signal.get('summary') or ''}".lower()
+    return [token for token in TOKEN_RE.findall(text) if len(token) > 1 and token not in STOPWORDS]
+
+
+def signal_key(signal: dict[str, Any], tokens: list[str]) -> str:
+    # The id (url, then title, when there is none) plus a hash of the indexed
+    # terms. Web ids such as "web_001" are reused every run, so the id alone
+    # does not name a document; with the hash, a reused id with new content is
+    # a new document, and a key found in the index holds exactly these terms.
+    ident = str(signal.get("id") or signal.get("url") or signal.get("title") or "").strip()
+    content = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()[:16]
+    return f"{ident}#sha256:{content}"
+
+
+def chunks(values: list[str]) -> Iterable[list[str]]:
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        yield values[start : start + LOOKUP_CHUNK]
+
+
+class NoveltyIndex:
+    """Document frequencies of title + summary terms over every signal added so far.
+
+    Updates are append-only: a signal is indexed once (keyed by ``signal_key``,
+    its id plus a hash of its terms), which bumps the document frequency of
+    each distinct term it contains. Scoring a
+    batch reads the frequencies of just the batch's terms, so cost does not
+    depend on how much history has been indexed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, length INTEGER NOT NULL, added_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID")
+        self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        (terms,) = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()
+        return {"docs": int(meta.get("docs", 0)), "tokens": int(meta.get("tokens", 0)), "terms": int(terms)}
+
+    def _lookup(self, sql: str, keys: Iterable[str]) -> dict[str, int]:
+        found: dict[str, int] = {}
+        for chunk in chunks(sorted(set(keys))):
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self._conn.execute(sql.format(placeholders), chunk).fetchall())
+        return found
+
+    def add(self, signals: Iterable[dict[str, Any]]) -> int:
+        batch: dict[str, list[str]] = {}
+        for sig in signals:
+            tokens = tokenize(sig)
+            batch.setdefault(signal_key(sig, tokens), tokens)
+        known = self._lookup("SELECT id, length FROM docs WHERE id IN ({})", batch)
+        new_docs = {key: tokens for key, tokens in batch.items() if key not in known}
+        if not new_docs:
+            return 0
+        df: Counter[str] = Counter()
+        for tokens in new_docs.values():
+            df.update(set(tokens))
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO docs (id, length, added_at) VALUES (?, ?, ?)",
+                ((key, len(tokens), now) for key, tokens in new_docs.items()),
+            )
+            self._conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                sorted(df.items()),
+            )
+            self._conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                [("docs", len(new_docs)), ("tokens", sum(len(tokens) for tokens in new_docs.values()))],
+            )
+        return len(new_docs)
+
+    def novelty(self, signals: list[dict[str, Any]]) -> list[float]:
+        # Per signal: sum over its terms of BM25 tf weight * idf, divided by the
+        # same sum if none of its terms had been seen, so 1.0 is entirely new
+        # vocabulary and values near 0 are terms present in most history.
+        # A signal whose exact content is already indexed under its id is
+        # scored against history without that entry, so re-ranking an indexed
+        # batch gives the same result. The same text under another id, or a
+        # reused id with other text, is scored against all of history.
+        token_lists = [tokenize(sig) for sig in signals]
+        keys = [signal_key(sig, tokens) for sig, tokens in zip(signals, token_lists)]
+        stats = self.stats()
+        df = self._lookup("SELECT term, df FROM terms WHERE term IN ({})", (t for tokens in token_lists for t in tokens))
+        indexed = self._lookup("SELECT id, length FROM docs WHERE id IN ({})", keys)
+        scores: list[float] = []
+        for key, tokens in zip(keys, token_lists):
+            if not tokens:
+                scores.append(0.0)
+                continue
+            docs, total = stats["docs"], stats["tokens"]
+            own = key in indexed
+            if own:
+                docs -= 1
+                total -= indexed[key]
+            avgdl = total / docs if docs else len(tokens)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / avgdl) if avgdl else BM25_K1
+            idf_max = math.log(1 + (docs + 0.5) / 0.5)
+            weighted = 0.0
+            ceiling = 0.0
+            # An own entry has the same key, so it holds exactly these terms.
+            for term, tf in Counter(tokens).items():
+                weight = tf * (BM25_K1 + 1) / (tf + norm)
+                term_df = max(df.get(term, 0) - (1 if own else 0), 0)
+                weighted += weight * math.log(1 + (docs - term_df + 0.5) / (term_df + 0.5))
+                ceiling += weight * idf_max
+            scores.append(round(weighted / ceiling, 4))
+        return scores
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Build or extend the signal novelty index from past signal files")
+    p.add_argument("--index", default="artifacts/novelty_index.sqlite", help="Path to the novelty index")
+    p.add_argument(
+        "--add",
+        action="append",
+        default=[],
+        help="raw_signals.json / ranked_signals.json (JSON array or NDJSON) to index; repeatable",
+    )
+    return p.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args(sys.argv[1:])
+    index = NoveltyIndex(Path(args.index))
+    try:
+        added = 0
+        for name in args.add:
+            path = Path(name)
+            if not path.exists():
+                print(f"Error: {path} not found", file=sys.stderr)
+                return 1
+            with path.open(encoding="utf-8") as f:
+                added += index.add(iter_stream_records(f, str(path)))
+        print(json.dumps({"added": added, **index.stats()}, indent=2))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
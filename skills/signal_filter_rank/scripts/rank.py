@@ -1,57 +1,224 @@
-import json
+#!/usr/bin/env python3
+"""Score signals with a weighted feature config and keep the top-k."""
+
+from __future__ import annotations
+
 import argparse
+import heapq
+import json
 import sys
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "rss-fetch" / "scripts"))
+
+from json_records import iter_stream_records  # noqa: E402
+
+if TYPE_CHECKING:
+    from novelty_index import NoveltyIndex
+
+# Heuristics for "Transformation Potential". Keyword terms match as
+# case-insensitive substrings of the listed fields; mode "each" adds the weight
+# once per matching term, "any" once if any term matches.
+DEFAULT_CONFIG: dict[str, Any] = {
+    "keywords": [
+        {
+            "terms": ["agent", "infrastructure", "verification", "governance", "protocol", "identity", "trust"],
+            "fields": ["title", "summary"],
+            "weight": 2,
+            "mode": "each",
+        },
+        {"terms": ["autonomous", "control"], "fields": ["summary"], "weight": 2, "mode": "any"},
+    ],
+    "categories": {"agents": 3, "infrastructure": 3, "fintech": 3},
+    "sources": {},
+    "channels": {},
+    "recency": {"weight": 0, "half_life_days": 7},
+    # Applied only when a novelty index is given (--novelty-index).
+    "novelty": {"weight": 3},
+}
+KEYWORD_FIELDS = ("title", "summary", "category", "source")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rank signals by transformation potential and print the top-k")
+    parser.add_argument("--input", help="Path to signals as a JSON array or NDJSON (default: stdin)")
+    parser.add_argument("--top-k", type=int, default=3, help="Number of top signals to print")
+    parser.add_argument("--config", default=None, help="JSON feature weights overriding the built-in defaults")
+    parser.add_argument(
+        "--as-of",
+        default=None,
+        help="Reference date (YYYY-MM-DD) for recency decay (default: today, UTC)",
+    )
+    parser.add_argument(
+        "--novelty-index",
+        default=None,
+        help="Novelty index (novelty_index.py) to score signals against past runs; adds novelty.weight * novelty",
+    )
+    parser.add_argument(
+        "--update-novelty-index",
+        action="store_true",
+        help="After ranking, append the input signals to --novelty-index",
+    )
+    return parser.parse_args(argv)
+
+
+class Scorer:
+    """Feature weights compiled once, then applied to any number of signals.
+
+    Scores are the sum of keyword hits, category, source and channel weights,
+    plus ``recency.weight * 0.5 ** (age_days / half_life_days)`` for signals
+    with a ``date``, plus ``novelty.weight`` times the signal's novelty against
+    ``novelty`` (a NoveltyIndex) when one is given. Category, source and
+    channel names compare lowercased.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        as_of: date | None = None,
+        novelty: NoveltyIndex | None = None,
+    ) -> None:
+        config = {**DEFAULT_CONFIG, **(config or {})}
+        self.keyword_groups: list[tuple[tuple[str, ...], tuple[str, ...], float, bool]] = []
+        for group in config["keywords"]:
+            fields = tuple(group.get("fields", ["title", "summary"]))
+            unknown = [field for field in fields if field not in KEYWORD_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown keyword fields {unknown}; expected some of {list(KEYWORD_FIELDS)}")
+            mode = group.get("mode", "each")
+            if mode not in ("each", "any"):
+                raise ValueError(f"Keyword mode must be 'each' or 'any', got {mode!r}")
+            terms = tuple(str(term).lower() for term in group["terms"])
+            self.keyword_groups.append((terms, fields, group.get("weight", 1), mode == "any"))
+        self.categories = {str(k).lower(): v for k, v in config["categories"].items()}
+        self.sources = {str(k).lower(): v for k, v in config["sources"].items()}
+        self.channels = {str(k).lower(): v for k, v in config["channels"].items()}
+        recency = {**DEFAULT_CONFIG["recency"], **config["recency"]}
+        self.recency_weight = recency["weight"]
+        self.half_life_days = float(recency["half_life_days"])
+        if self.recency_weight and self.half_life_days <= 0:
+            raise ValueError("recency.half_life_days must be > 0")
+        self.as_of = as_of or datetime.now(timezone.utc).date()
+        self._decay: dict[str, float] = {}
+        self.novelty = novelty
+        self.novelty_weight = {**DEFAULT_CONFIG["novelty"], **config["novelty"]}["weight"]
+
+    def recency(self, value: Any) -> float:
+        # Decay factors are cached per distinct date string.
+        key = str(value or "")
+        factor = self._decay.get(key)
+        if factor is None:
+            try:
+                age_days = max((self.as_of - date.fromisoformat(key[:10])).days, 0)
+                factor = 0.5 ** (age_days / self.half_life_days)
+            except ValueError:
+                factor = 0.0
+            self._decay[key] = factor
+        return factor
+
+    def score(self, signal: dict[str, Any]) -> float:
+        return self.score_batch([signal])[0]
 
-def score_signal(signal):
-    score = 0
-    title = signal['title'].lower()
-    summary = signal['summary'].lower()
-    category = signal['category'].lower()
-    
-    # Heuristics for "Transformation Potential"
-    keywords = ['agent', 'infrastructure', 'verification', 'governance', 'protocol', 'identity', 'trust']
-    
-    for word in keywords:
-        if word in title or word in summary:
-            score += 2
-            
-    if category in ['agents', 'infrastructure', 'fintech']:
-        score += 3
-        
-    if "autonomous" in summary or "control" in summary:
-        score += 2
-        
-    return score
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--input', help='Path to input json file')
-    args = parser.parse_args()
-    
+    def score_batch(self, signals: list[dict[str, Any]]) -> list[float]:
+        # Column at a time: each field is lowercased once per signal, and a
+        # group's fields are joined with a newline so one substring test per
+        # term covers all of them.
+        columns: dict[str, list[str]] = {}
+
+        def column(field: str) -> list[str]:
+            values = columns.get(field)
+            if values is None:
+                values = columns[field] = [str(sig.get(field) or "").lower() for sig in signals]
+            return values
+
+        scores: list[float] = [0] * len(signals)
+        for terms, fields, weight, any_term in self.keyword_groups:
+            texts = column(fields[0]) if len(fields) == 1 else list(map("\n".join, zip(*map(column, fields))))
+            if any_term:
+                scores = [score + weight if any(map(text.__contains__, terms)) else score for score, text in zip(scores, texts)]
+            else:
+                scores = [score + weight * sum(map(text.__contains__, terms)) for score, text in zip(scores, texts)]
+        for field, weights in (("category", self.categories), ("source", self.sources), ("channel", self.channels)):
+            if weights:
+                scores = [score + weights.get(value, 0) for score, value in zip(scores, column(field))]
+        if self.recency_weight:
+            weight = self.recency_weight
+            scores = [
+                score + round(weight * self.recency(sig["date"]), 4) if sig.get("date") else score
+                for score, sig in zip(scores, signals)
+            ]
+        if self.novelty is not None and self.novelty_weight:
+            weight = self.novelty_weight
+            scores = [score + round(weight * novelty, 4) for score, novelty in zip(scores, self.novelty.novelty(signals))]
+        return scores
+
+
+DEFAULT_SCORER = Scorer()
+
+
+def load_config(path: Path) -> dict[str, Any]:
+    config = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(config, dict):
+        raise ValueError(f"Expected a JSON object in {path}")
+    unknown = sorted(set(config) - set(DEFAULT_CONFIG))
+    if unknown:
+        raise ValueError(f"Unknown config keys {unknown} in {path}")
+    return config
+
+
+def score_signal(signal: dict[str, Any]) -> float:
+    return DEFAULT_SCORER.score(signal)
+
+
+def rank_signals(signals: Iterable[dict[str, Any]], top: int = 3, scorer: Scorer | None = None) -> list[dict[str, Any]]:
+    # Heap-based top-k; equal scores keep input order. Only the selected
+    # signals are copied, with their score added.
+    scorer = scorer or DEFAULT_SCORER
+    signals = signals if isinstance(signals, list) else list(signals)
+    scores = scorer.score_batch(signals)
+    best = heapq.nlargest(top, range(len(signals)), key=lambda i: (scores[i], -i))
+    return [{**signals[i], "score": scores[i]} for i in best]
+
+
+def main() -> int:
+    args = parse_args()
     try:
+        if args.top_k <= 0:
+            raise ValueError("--top-k must be > 0")
+        config = load_config(Path(args.config)) if args.config else None
+        as_of = date.fromisoformat(args.as_of) if args.as_of else None
+        if args.update_novelty_index and not args.novelty_index:
+            raise ValueError("--update-novelty-index requires --novelty-index")
         if args.input:
-            with open(args.input, 'r') as f:
-                signals = json.load(f)
+            with open(args.input, encoding="utf-8") as f:
+                signals = list(iter_stream_records(f, args.input))
         else:
-            # Read from stdin if no file
-            input_data = sys.stdin.read()
-            if not input_data:
+            signals = list(iter_stream_records(sys.stdin, "stdin"))
+            if not signals:
                 print("No input provided")
-                return
-            signals = json.loads(input_data)
-            
-        # Score and Sort
-        for sig in signals:
-            sig['score'] = score_signal(sig)
-            
-        # Sort descending by score
-        ranked_signals = sorted(signals, key=lambda x: x['score'], reverse=True)
-        
-        # Return top 3
-        print(json.dumps(ranked_signals[:3], indent=2))
-        
-    except Exception as e:
+                return 0
+        if not args.novelty_index:
+            scorer = Scorer(config, as_of) if config or as_of else DEFAULT_SCORER
+            print(json.dumps(rank_signals(signals, args.top_k, scorer), indent=2))
+            return 0
+
+        from novelty_index import NoveltyIndex
+
+        index = NoveltyIndex(Path(args.novelty_index))
+        try:
+            print(json.dumps(rank_signals(signals, args.top_k, Scorer(config, as_of, index)), indent=2))
+            if args.update_novelty_index:
+                index.add(signals)
+        finally:
+            index.close()
+        return 0
+    except (OSError, ValueError, KeyError, TypeError) as e:
         print(f"Error: {e}", file=sys.stderr)
+        return 1
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark category inference: compiled classifier vs. the previous substring scan (offline, stdlib only)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from category_classifier import CategoryClassifier  # noqa: E402
+from merge_signals import CATEGORY_KEYWORDS  # noqa: E402
+
+FILLER = (
+    "the a new company said launch update report market device decision ecosystem team model data users "
+    "release quarter growth partner service customers feature product research network"
+).split()
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Reference implementation of the per-item substring scan used before the
+# compiled classifier, kept here only as the benchmark baseline.
+def legacy_infer_category(keywords: dict[str, list[str]], text: str) -> str:
+    text = text.lower()
+    best_name = "Industry"
+    best_score = 0
+    for name, terms in keywords.items():
+        score = sum(1 for term in terms if term in text)
+        if score > best_score:
+            best_score = score
+            best_name = name
+    return best_name
+
+
+def grown_keywords(extra_terms: int, seed: int) -> dict[str, list[str]]:
+    # The built-in table plus synthetic terms spread across its categories.
+    rng = random.Random(seed)
+    table = {name: list(terms) for name, terms in CATEGORY_KEYWORDS.items()}
+    names = list(table)
+    for i in range(extra_terms):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 10)))
+        table[names[i % len(names)]].append(word if i % 4 else f"{word} {FILLER[i % len(FILLER)]}")
+    return table
+
+
+def synthetic_texts(count: int, keywords: dict[str, list[str]], seed: int) -> list[str]:
+    rng = random.Random(seed)
+    terms = [term for group in keywords.values() for term in group]
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(20, 40))]
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        texts.append(" ".join(words).capitalize())
+    return texts
+
+
+def bench_case(name: str, keywords: dict[str, list[str]], items: int, repeat: int, seed: int) -> dict[str, Any]:
+    texts = synthetic_texts(items, keywords, seed)
+    build_start = time.perf_counter()
+    classifier = CategoryClassifier(keywords)
+    build_s = time.perf_counter() - build_start
+
+    legacy = [legacy_infer_category(keywords, text) for text in texts]
+    compiled = classifier.classify_batch(texts)
+    legacy_s = best_of(lambda: [legacy_infer_category(keywords, text) for text in texts], repeat)
+    compiled_s = best_of(lambda: classifier.classify_batch(texts), repeat)
+    return {
+        "case": name,
+        "items": items,
+        "terms": sum(len(terms) for terms in keywords.values()),
+        "legacy_ms": round(legacy_s * 1000, 3),
+        "compiled_ms": round(compiled_s * 1000, 3),
+        "speedup": round(legacy_s / compiled_s, 2) if compiled_s else None,
+        "build_ms": round(build_s * 1000, 3),
+        # Word-boundary matching intentionally disagrees where a term only
+        # occurred inside another word.
+        "changed_categories": sum(1 for old, new in zip(legacy, compiled) if old != new),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark category inference over synthetic signals")
+    parser.add_argument("--items", type=int, default=50000, help="Synthetic title+summary texts per case")
+    parser.add_argument("--extra-terms", type=int, default=500, help="Synthetic terms added for the grown-table case")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions per case (best time is reported)")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for synthetic texts and terms")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results = [
+        bench_case("builtin_table", CATEGORY_KEYWORDS, args.items, args.repeat, args.seed),
+        bench_case(f"grown_table_{args.extra_terms}", grown_keywords(args.extra_terms, args.seed), args.items, args.repeat, args.seed),
+    ]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""Keyword category classifier: one compiled trie regex with word-boundary matching."""
+
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+DEFAULT_CATEGORY = "Industry"
+SPACE_RE = re.compile(r"\s+")
+ITEM_SEPARATOR = "\x00"
+
+
+def normalize_term(term: str) -> str:
+    return SPACE_RE.sub(" ", term.strip().lower())
+
+
+def trie_pattern(terms: Iterable[str]) -> str:
+    # Alternation factored by common prefix ("bank|banking" -> "bank(?:ing)?"),
+    # so matching cost at a position does not grow with the number of terms.
+    # Longer continuations are tried first; a space in a term matches any run
+    # of whitespace.
+    root: dict[str, dict] = {}
+    for term in terms:
+        node = root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        branches = [(r"\s+" if ch == " " else re.escape(ch)) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+def load_category_keywords(path: Path) -> dict[str, list[str]]:
+    # JSON object of category -> list of terms; key order is the tie-break order.
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read category keywords from {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object of category -> terms in {path}")
+    table: dict[str, list[str]] = {}
+    for name, terms in data.items():
+        if not isinstance(terms, list) or not all(isinstance(term, str) for term in terms):
+            raise ValueError(f"Category {name!r} in {path} must map to a list of strings")
+        table[str(name)] = terms
+    return table
+
+
+class CategoryClassifier:
+    """Scores each category by how many of its distinct terms occur in a text.
+
+    Terms match whole words (an optional plural "s"/"es" is allowed), so "ci"
+    does not fire inside "decision" nor "dev" inside "device". All terms are
+    compiled into one regex; a lookahead at every word start finds overlapping
+    hits such as "agent" inside "multi-agent", and a hit on a phrase also
+    credits the shorter terms it starts with ("copilot studio" -> "copilot").
+    The highest score wins, ties go to the category listed first, and texts
+    without hits get ``default``.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]], default: str = DEFAULT_CATEGORY) -> None:
+        self.categories = list(keywords)
+        self.default = default
+        term_categories: dict[str, list[int]] = {}
+        for index, name in enumerate(self.categories):
+            for term in keywords[name]:
+                term = normalize_term(term)
+                if term and index not in term_categories.setdefault(term, []):
+                    term_categories[term].append(index)
+        # Every term a matched term stands for: itself plus its word-prefix terms.
+        self._credits: dict[str, list[tuple[int, str]]] = {}
+        for term in term_categories:
+            self._credits[term] = [
+                (index, other)
+                for other, indexes in term_categories.items()
+                if other == term or (term.startswith(other) and not term[len(other)].isalnum())
+                for index in indexes
+            ]
+        self._pattern = None
+        if term_categories:
+            self._pattern = re.compile(r"(?<![a-z0-9])(?=(" + trie_pattern(term_categories) + r")(?:e?s)?(?![a-z0-9]))")
+
+    def classify(self, text: str) -> str:
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: Iterable[str]) -> list[str]:
+        # One regex pass over the whole batch; each hit is assigned to its text
+        # by offset. Texts are joined with NUL, which neither "\s" nor a word
+        # character matches, so a phrase cannot span two texts.
+        texts = [text.lower() for text in texts]
+        if self._pattern is None:
+            return [self.default] * len(texts)
+        starts: list[int] = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        found: list[dict[int, set[str]] | None] = [None] * len(texts)
+        credits = self._credits
+        for match in self._pattern.finditer(ITEM_SEPARATOR.join(texts)):
+            term = match.group(1)
+            if term not in credits:
+                term = SPACE_RE.sub(" ", term)
+            item = bisect_right(starts, match.start()) - 1
+            hits = found[item]
+            if hits is None:
+                hits = found[item] = {}
+            for index, credited in credits[term]:
+                hits.setdefault(index, set()).add(credited)
+        return [self._best(hits) for hits in found]
+
+    def _best(self, hits: dict[int, set[str]] | None) -> str:
+        if not hits:
+            return self.default
+        best_index = min(hits, key=lambda index: (-len(hits[index]), index))
+        return self.categories[best_index]
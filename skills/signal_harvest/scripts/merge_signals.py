@@ -5,11 +5,20 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import heapq
 import json
 import re
+import sys
+import zlib
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "rss-fetch" / "scripts"))
+
+from category_classifier import CategoryClassifier, load_category_keywords  # noqa: E402
+from json_records import iter_records  # noqa: E402
 
 
 CATEGORY_KEYWORDS = {
@@ -21,26 +30,56 @@ CATEGORY_KEYWORDS = {
     "Enterprise Software": ["enterprise", "saas", "crm", "erp", "workflow", "copilot studio"],
     "Fintech": ["bank", "banking", "fintech", "payments", "wallet", "trading"],
 }
+DEFAULT_CLASSIFIER = CategoryClassifier(CATEGORY_KEYWORDS)
+
+
+# Near-duplicate clustering: MinHash over word shingles of title + summary,
+# bucketed by LSH bands (BANDS x ROWS = signature length). Candidate pairs are
+# confirmed when the estimated Jaccard similarity reaches the threshold.
+SHINGLE_WORDS = 3
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MINHASH_BINS = MINHASH_BANDS * MINHASH_ROWS  # power of two: bins are the top hash bits
+MINHASH_VALUE_BITS = 64 - (MINHASH_BINS.bit_length() - 1)
+MINHASH_VALUE_MASK = (1 << MINHASH_VALUE_BITS) - 1
+MINHASH_MASK = (1 << 64) - 1
+MINHASH_MULTIPLIER = 0x9E3779B97F4A7C15
+NEAR_DUP_THRESHOLD = 0.6
+TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Merge web and RSS signals into one JSON list")
     parser.add_argument("--web-signals", default="artifacts/web_signals.json", help="Path to web signals JSON list")
-    parser.add_argument("--rss-items", default="skills/rss-fetch/data/items.json", help="Path to rss-fetch items.json")
+    parser.add_argument("--rss-items", default="skills/rss-fetch/data/items.json", help="Path to rss-fetch items.json (JSON array or NDJSON)")
     parser.add_argument("--output", default="artifacts/raw_signals.json", help="Path to merged output JSON")
     parser.add_argument("--max-signals", type=int, default=12, help="Maximum number of merged signals")
     parser.add_argument("--min-web", type=int, default=4, help="Minimum number of web channel signals to keep (if available)")
     parser.add_argument("--min-rss", type=int, default=4, help="Minimum number of rss channel signals to keep (if available)")
+    parser.add_argument(
+        "--quota",
+        action="append",
+        type=parse_quota,
+        default=[],
+        metavar="CHANNEL=MIN[:MAX]",
+        help="Per-channel minimum and optional maximum of kept signals (repeatable; overrides --min-web/--min-rss)",
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=float,
+        default=NEAR_DUP_THRESHOLD,
+        help="Estimated title+summary Jaccard similarity at which signals are clustered as near-duplicates (0 disables)",
+    )
+    parser.add_argument(
+        "--category-keywords",
+        default=None,
+        help="JSON file mapping category -> keyword list, replacing the built-in table for inferred categories",
+    )
     return parser.parse_args()
 
 
 def load_json_array(path: Path) -> list[dict]:
-    if not path.exists():
-        return []
-    data = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(data, list):
-        raise ValueError(f"Expected JSON array in {path}")
-    return [x for x in data if isinstance(x, dict)]
+    return list(iter_records(path))
 
 
 def normalize_title(value: str) -> str:
@@ -65,16 +104,8 @@ def iso_or_none(value: str | None) -> str | None:
         return None
 
 
-def infer_category(title: str, summary: str) -> str:
-    text = f"{title} {summary}".lower()
-    best_name = "Industry"
-    best_score = 0
-    for name, terms in CATEGORY_KEYWORDS.items():
-        score = sum(1 for term in terms if term in text)
-        if score > best_score:
-            best_score = score
-            best_name = name
-    return best_name
+def infer_category(title: str, summary: str, classifier: CategoryClassifier | None = None) -> str:
+    return (classifier or DEFAULT_CLASSIFIER).classify(f"{title} {summary}")
 
 
 def stable_id(channel: str, title: str, url: str) -> str:
@@ -98,7 +129,8 @@ def to_web_signal(item: dict) -> dict | None:
         return None
     url = str(item.get("url", "")).strip()
     summary = str(item.get("summary", "")).strip()
-    category = str(item.get("category", "")).strip() or infer_category(title, summary)
+    # Left empty when not given; merge_records infers it for the whole batch.
+    category = str(item.get("category", "")).strip()
     date = iso_or_none(item.get("date"))
 
     return {
@@ -123,14 +155,13 @@ def to_rss_signal(item: dict) -> dict | None:
     if not isinstance(source_obj, dict):
         source_obj = {}
     source = source_obj.get("title") or source_obj.get("site") or source_obj.get("feed_url")
-    category = infer_category(title, summary)
     date = iso_or_none(item.get("published_at"))
 
     return {
         "id": stable_id("rss", title or url, url),
         "title": title or url,
         "summary": summary,
-        "category": category,
+        "category": "",
         "source": format_source(source, url),
         "date": date,
         "url": url,
@@ -138,25 +169,99 @@ def to_rss_signal(item: dict) -> dict | None:
     }
 
 
-def dedupe(signals: list[dict]) -> list[dict]:
-    seen_urls: set[str] = set()
-    seen_titles: set[str] = set()
-    out: list[dict] = []
+def canonical_url(value: str) -> str:
+    # Lowercased, without fragment, utm_* parameters, "www." or trailing slash;
+    # remaining query parameters are sorted.
+    raw = value.strip().lower()
+    if not raw:
+        return ""
+    parsed = urlparse(raw)
+    host = parsed.netloc[4:] if parsed.netloc.startswith("www.") else parsed.netloc
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not k.startswith("utm_")))
+    return urlunparse((parsed.scheme, host, parsed.path.rstrip("/"), parsed.params, query, ""))
 
-    for sig in signals:
-        url = str(sig.get("url", "")).strip().lower()
+
+def minhash_signature(text: str) -> list[int] | None:
+    tokens = TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    if len(tokens) < SHINGLE_WORDS:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = list(map(" ".join, zip(*(tokens[i:] for i in range(SHINGLE_WORDS)))))
+    # One permutation hashing: each shingle is hashed once (crc32 spread over 64
+    # bits by an odd multiplier, so the order is still a permutation); the top
+    # bits pick a bin and each bin keeps its smallest value. Walking the hashes
+    # largest first lets the dict keep the minimum per bin. Empty bins borrow the
+    # next non-empty bin's value offset by the distance (rotation densification),
+    # which keeps the bin-match rate an unbiased Jaccard estimate.
+    hashes = sorted([(h * MINHASH_MULTIPLIER) & MINHASH_MASK for h in map(zlib.crc32, map(str.encode, shingles))], reverse=True)
+    bins = {h >> MINHASH_VALUE_BITS: h & MINHASH_VALUE_MASK for h in hashes}
+    signature = [0] * MINHASH_BINS
+    for index in range(MINHASH_BINS):
+        distance = 0
+        value = bins.get(index)
+        while value is None:
+            distance += 1
+            value = bins.get((index + distance) % MINHASH_BINS)
+        signature[index] = value + (distance << MINHASH_VALUE_BITS)
+    return signature
+
+
+def estimated_jaccard(left: list[int], right: list[int]) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+def dedupe(signals: list[dict], near_dup_threshold: float = NEAR_DUP_THRESHOLD) -> list[dict]:
+    # Clusters exact duplicates (canonical URL or normalized title) and near
+    # duplicates (MinHash/LSH), keeping the first signal of each cluster with
+    # cluster_size set. Each signal is compared only with the first member of
+    # each LSH bucket it lands in, so cost stays linear in len(signals).
+    parent = list(range(len(signals)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # The earliest signal stays the root, so it is the one kept.
+            parent[max(ri, rj)] = min(ri, rj)
+
+    first_by_url: dict[str, int] = {}
+    first_by_title: dict[str, int] = {}
+    for i, sig in enumerate(signals):
+        url = canonical_url(str(sig.get("url", "")))
         nt = normalize_title(str(sig.get("title", "")))
-        if url and url in seen_urls:
-            continue
-        if nt and nt in seen_titles:
-            continue
         if url:
-            seen_urls.add(url)
+            union(i, first_by_url.setdefault(url, i))
         if nt:
-            seen_titles.add(nt)
-        out.append(sig)
-
-    return out
+            union(i, first_by_title.setdefault(nt, i))
+
+    if near_dup_threshold > 0:
+        buckets: dict[tuple[int, tuple[int, ...]], int] = {}
+        signatures: dict[int, list[int]] = {}
+        for i, sig in enumerate(signals):
+            if find(i) != i:
+                continue
+            signature = minhash_signature(f"{sig.get('title', '')} {sig.get('summary', '')}")
+            if signature is None:
+                continue
+            signatures[i] = signature
+            for band in range(MINHASH_BANDS):
+                key = (band, tuple(signature[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS]))
+                anchor = buckets.setdefault(key, i)
+                if anchor != i and find(anchor) != find(i) and estimated_jaccard(signatures[anchor], signature) >= near_dup_threshold:
+                    union(i, anchor)
+
+    sizes: dict[int, int] = {}
+    for i in range(len(signals)):
+        root = find(i)
+        sizes[root] = sizes.get(root, 0) + 1
+    return [{**signals[i], "cluster_size": sizes[i]} for i in range(len(signals)) if find(i) == i]
 
 
 def sort_key(sig: dict) -> tuple:
@@ -167,63 +272,123 @@ def sort_key(sig: dict) -> tuple:
     return (date, channel == "web", title)
 
 
-def select_balanced(signals: list[dict], max_signals: int, min_web: int, min_rss: int) -> list[dict]:
-    web = [s for s in signals if s.get("channel") == "web"]
-    rss = [s for s in signals if s.get("channel") == "rss"]
-    other = [s for s in signals if s.get("channel") not in {"web", "rss"}]
-
-    web.sort(key=sort_key, reverse=True)
-    rss.sort(key=sort_key, reverse=True)
-    other.sort(key=sort_key, reverse=True)
-
-    selected: list[dict] = []
-
-    for item in web[: max(0, min_web)]:
-        if len(selected) < max_signals:
-            selected.append(item)
-    for item in rss[: max(0, min_rss)]:
-        if len(selected) < max_signals:
-            selected.append(item)
-
-    used_ids = {item.get("id") for item in selected}
-    remainder = [s for s in sorted(signals, key=sort_key, reverse=True) if s.get("id") not in used_ids]
-    for item in remainder:
-        if len(selected) >= max_signals:
-            break
-        selected.append(item)
-
-    return selected
+def parse_quota(value: str) -> tuple[str, int, int | None]:
+    # "channel=MIN" or "channel=MIN:MAX"; an empty MAX means no maximum.
+    channel, sep, bounds = value.partition("=")
+    low, _, high = bounds.partition(":")
+    try:
+        quota = (channel.strip(), int(low or 0), int(high) if high else None)
+    except ValueError:
+        quota = ("", 0, None)
+    if not sep or not quota[0] or quota[1] < 0 or (quota[2] is not None and quota[2] < quota[1]):
+        raise argparse.ArgumentTypeError(f"expected channel=MIN[:MAX] with 0 <= MIN <= MAX, got {value!r}")
+    return quota
+
+
+def channel_quotas(min_web: int, min_rss: int, overrides: Iterable[tuple[str, int, int | None]] = ()) -> dict[str, tuple[int, int | None]]:
+    # web and rss minimums first (the order minimums are filled in), then any
+    # --quota channels; a --quota for web/rss replaces its --min-* value.
+    quotas: dict[str, tuple[int, int | None]] = {"web": (max(0, min_web), None), "rss": (max(0, min_rss), None)}
+    for channel, low, high in overrides:
+        quotas[channel] = (low, high)
+    return quotas
+
+
+def select_quota(signals: list[dict], max_signals: int, quotas: dict[str, tuple[int, int | None]]) -> list[dict]:
+    # Fills each channel's minimum (in quota order) with its best signals by
+    # sort_key, then the remaining slots with the best of everything else,
+    # never taking more than a channel's maximum. Channels without a quota have
+    # neither. Every pick is a heap top-k, so cost is O(n log max_signals);
+    # equal keys keep input order, like a stable sort.
+    keys = [(sort_key(sig), -i) for i, sig in enumerate(signals)]
+    by_channel: dict[str, list[int]] = {}
+    for i, sig in enumerate(signals):
+        by_channel.setdefault(sig.get("channel") or "", []).append(i)
+
+    selected: list[int] = []
+    taken: dict[str, int] = {}
+    for channel, (low, high) in quotas.items():
+        want = min(low, high if high is not None else low, max_signals - len(selected))
+        if want <= 0:
+            continue
+        best = heapq.nlargest(want, by_channel.get(channel, []), key=keys.__getitem__)
+        selected.extend(best)
+        taken[channel] = len(best)
 
+    slots = max_signals - len(selected)
+    if slots > 0:
+        used_ids = {signals[i].get("id") for i in selected}
+        candidates: list[int] = []
+        for channel, indexes in by_channel.items():
+            high = quotas.get(channel, (0, None))[1]
+            room = slots if high is None else min(slots, high - taken.get(channel, 0))
+            if room > 0:
+                rest = (i for i in indexes if signals[i].get("id") not in used_ids)
+                candidates.extend(heapq.nlargest(room, rest, key=keys.__getitem__))
+        selected.extend(heapq.nlargest(slots, candidates, key=keys.__getitem__))
 
-def main() -> int:
-    args = parse_args()
+    return [signals[i] for i in selected]
 
-    web_items = load_json_array(Path(args.web_signals))
-    rss_items = load_json_array(Path(args.rss_items))
 
+def select_balanced(signals: list[dict], max_signals: int, min_web: int, min_rss: int) -> list[dict]:
+    return select_quota(signals, max_signals, channel_quotas(min_web, min_rss))
+
+
+def merge_records(
+    web_items: list[dict],
+    rss_items: Iterable[dict],
+    max_signals: int,
+    min_web: int,
+    min_rss: int,
+    near_dup_threshold: float = NEAR_DUP_THRESHOLD,
+    classifier: CategoryClassifier | None = None,
+    quotas: Iterable[tuple[str, int, int | None]] = (),
+) -> tuple[list[dict], dict]:
+    # rss_items may be a lazy record stream; it is consumed once.
     merged: list[dict] = []
     for item in web_items:
         sig = to_web_signal(item)
         if sig:
             merged.append(sig)
+    rss_count = 0
     for item in rss_items:
+        rss_count += 1
         sig = to_rss_signal(item)
         if sig:
             merged.append(sig)
 
-    deduped = dedupe(merged)
-    final = select_balanced(
-        deduped,
+    uncategorized = [sig for sig in merged if not sig["category"]]
+    categories = (classifier or DEFAULT_CLASSIFIER).classify_batch(f"{sig['title']} {sig['summary']}" for sig in uncategorized)
+    for sig, category in zip(uncategorized, categories):
+        sig["category"] = category
+
+    deduped = dedupe(merged, near_dup_threshold)
+    final = select_quota(deduped, max_signals, channel_quotas(min_web, min_rss, quotas))
+    stats = {"web": len(web_items), "rss": rss_count, "merged": len(merged), "deduped": len(deduped), "written": len(final)}
+    return final, stats
+
+
+def main() -> int:
+    args = parse_args()
+
+    web_items = load_json_array(Path(args.web_signals))
+    classifier = CategoryClassifier(load_category_keywords(Path(args.category_keywords))) if args.category_keywords else None
+    final, stats = merge_records(
+        web_items,
+        iter_records(Path(args.rss_items)),
         max_signals=args.max_signals,
         min_web=args.min_web,
         min_rss=args.min_rss,
+        near_dup_threshold=args.near_dup_threshold,
+        classifier=classifier,
+        quotas=args.quota,
     )
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(final, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
-    print(json.dumps({"web": len(web_items), "rss": len(rss_items), "merged": len(merged), "deduped": len(deduped), "written": len(final)}, indent=2))
+    print(json.dumps(stats, indent=2))
     return 0
 
 
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Offline self-check for signal_harvest category inference, dedupe, selection, and novelty scoring."""
+
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS))
+sys.path.insert(0, str(SCRIPTS.parents[1] / "signal_filter_rank" / "scripts"))
+
+from merge_signals import DEFAULT_CLASSIFIER, canonical_url, channel_quotas, dedupe, select_balanced, select_quota, sort_key  # noqa: E402
+from novelty_index import NoveltyIndex  # noqa: E402
+
+
+def assert_true(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def check_classifier() -> None:
+    # "ai" ends the first text and "act" starts the second: together they
+    # would spell the Regulation term "ai act".
+    texts = ["New model from AI", "Act now on weather", "EU AI Act compliance deadline", "", "Copilot for developers"]
+    batched = DEFAULT_CLASSIFIER.classify_batch(texts)
+    single = [DEFAULT_CLASSIFIER.classify(text) for text in texts]
+    assert_true(batched == single, f"Batch classification should match per-text classification: {batched} != {single}")
+    assert_true(batched[0] == "Industry", f"A phrase must not span two texts: {batched[0]}")
+    assert_true(batched[2] == "Regulation", f"A phrase inside one text should still match: {batched[2]}")
+
+
+def check_dedupe() -> None:
+    variants = [
+        "https://www.example.com/news/launch/?utm_source=feed&utm_medium=rss",
+        "https://example.com/news/launch",
+        "https://EXAMPLE.com/news/launch/#comments",
+    ]
+    canonical = {canonical_url(url) for url in variants}
+    assert_true(canonical == {"https://example.com/news/launch"}, f"URL variants should share one canonical URL: {canonical}")
+    by_url = dedupe([{"id": f"u{i}", "title": f"Headline {i}", "url": url} for i, url in enumerate(variants)])
+    assert_true(
+        [(sig["id"], sig["cluster_size"]) for sig in by_url] == [("u0", 3)],
+        f"Signals with URL variants should form one cluster: {by_url}",
+    )
+
+    summary = "The toolkit lets enterprises build and deploy autonomous agents on their own infrastructure."
+    signals = [
+        {"id": "a", "title": "OpenAI releases new agent toolkit for enterprise developers today", "summary": summary, "url": "https://a.example/1"},
+        {"id": "b", "title": "OpenAI releases new agent toolkit for enterprise developers", "summary": summary, "url": "https://b.example/2"},
+        {
+            "id": "c",
+            "title": "Central bank publishes stablecoin guidance",
+            "summary": "Regulators outline reserve requirements for payment stablecoins issued by banks.",
+            "url": "https://c.example/3",
+        },
+    ]
+    clusters = [(sig["id"], sig["cluster_size"]) for sig in dedupe(signals)]
+    assert_true(clusters == [("a", 2), ("c", 1)], f"Near-duplicate titles should cluster and distinct ones stay apart: {clusters}")
+    kept = [sig["id"] for sig in dedupe(signals, near_dup_threshold=0)]
+    assert_true(kept == ["a", "b", "c"], f"Near-duplicate matching should be off at threshold 0: {kept}")
+
+
+# Reference implementation of the sort-based web/rss selection used before
+# select_quota, kept here only to check that the two agree.
+def legacy_select_balanced(signals: list[dict], max_signals: int, min_web: int, min_rss: int) -> list[dict]:
+    web = sorted((sig for sig in signals if sig.get("channel") == "web"), key=sort_key, reverse=True)
+    rss = sorted((sig for sig in signals if sig.get("channel") == "rss"), key=sort_key, reverse=True)
+    selected: list[dict] = []
+    for group, minimum in ((web, min_web), (rss, min_rss)):
+        for item in group[: max(0, minimum)]:
+            if len(selected) < max_signals:
+                selected.append(item)
+    used_ids = {item.get("id") for item in selected}
+    for item in sorted(signals, key=sort_key, reverse=True):
+        if len(selected) >= max_signals:
+            break
+        if item.get("id") not in used_ids:
+            selected.append(item)
+    return selected
+
+
+def check_selection() -> None:
+    # Few distinct dates and titles, so sort_key ties are common.
+    rng = random.Random(25)
+    signals = [
+        {
+            "id": f"s{i}",
+            "channel": rng.choice(["web", "rss", "rss", "newsletter"]),
+            "date": rng.choice(["2026-01-02", "2026-01-03", "2026-01-03", None]),
+            "title": rng.choice(["Alpha", "Beta", "Gamma"]),
+        }
+        for i in range(60)
+    ]
+    for max_signals, min_web, min_rss in ((8, 3, 3), (8, 0, 0), (5, 4, 4), (12, 20, 1), (100, 2, 2), (0, 1, 1)):
+        expected = [sig["id"] for sig in legacy_select_balanced(signals, max_signals, min_web, min_rss)]
+        balanced = [sig["id"] for sig in select_balanced(signals, max_signals, min_web, min_rss)]
+        quota = [sig["id"] for sig in select_quota(signals, max_signals, channel_quotas(min_web, min_rss))]
+        case = (max_signals, min_web, min_rss)
+        assert_true(balanced == expected, f"select_balanced{case} differs from the sort-based selection: {balanced} != {expected}")
+        assert_true(quota == expected, f"select_quota{case} differs from the sort-based selection: {quota} != {expected}")
+
+
+def check_novelty() -> None:
+    history = [
+        {"id": "h1", "title": "Agent toolkit launches", "summary": "Enterprises deploy autonomous agents on cloud infrastructure."},
+        {"id": "h2", "title": "Cloud agent pricing", "summary": "Providers cut prices for hosted agents."},
+        {"id": "h3", "title": "Stablecoin rules", "summary": "Regulators publish reserve guidance for stablecoins."},
+    ]
+    batch = [
+        {"id": "n1", "title": "Agent marketplace opens", "summary": "Developers sell autonomous agents to enterprises."},
+        {"title": "Quantum sensor startup", "summary": "Funding round for navigation sensors.", "url": "https://q.example/1"},
+    ]
+    with tempfile.TemporaryDirectory(prefix="signal-harvest-selfcheck-") as tmp:
+        path = Path(tmp) / "novelty.sqlite"
+        index = NoveltyIndex(path)
+        index.add(history)
+        before = index.novelty(batch)
+        assert_true(before[1] > before[0] > 0, f"Unseen vocabulary should score as more novel: {before}")
+        for sig in batch:
+            expected = index.novelty([sig])
+            index.add([sig])
+            own = index.novelty([sig])
+            assert_true(own == expected, f"A signal's own indexed entry should not count against it: {own} != {expected}")
+        indexed = index.novelty(batch)
+        stats = index.stats()
+        index.close()
+
+        reopened = NoveltyIndex(path)
+        try:
+            assert_true(reopened.stats() == stats, f"Index stats should survive reopening: {reopened.stats()} != {stats}")
+            assert_true(reopened.novelty(batch) == indexed, "Novelty scores should survive reopening the index")
+            assert_true(reopened.add(batch) == 0, "Signals indexed before reopening should not be added again")
+        finally:
+            reopened.close()
+
+        # Web ids are reused every run: "w1" next run is a different story.
+        week1 = [
+            {"id": "w1", "title": "Chip export rules tighten", "summary": "New licensing limits on accelerator exports."},
+            {"id": "w2", "title": "Robotaxi fleet expands", "summary": "Driverless ride service adds three cities."},
+        ]
+        week2_new = {"id": "w1", "title": "Satellite broadband outage", "summary": "Orbital network loses service for hours."}
+        week2_repeat = {"id": "w1", "title": "Robotaxi fleet expands", "summary": "Driverless ride service adds three cities."}
+        index = NoveltyIndex(Path(tmp) / "reused.sqlite")
+        try:
+            index.add(week1)
+            repeat_scores = index.novelty([week2_repeat, {**week2_repeat, "id": "w9"}])
+            assert_true(
+                repeat_scores[0] == repeat_scores[1] < 0.5,
+                f"An old story under a reused id should score like the same text under a new id: {repeat_scores}",
+            )
+            assert_true(index.add([week2_new]) == 1, "A reused id with new content should be indexed as a new document")
+            assert_true(index.stats()["docs"] == 3, f"The reused id should add a document next to its week-1 content: {index.stats()}")
+        finally:
+            index.close()
+
+
+def main() -> int:
+    check_classifier()
+    check_dedupe()
+    check_selection()
+    check_novelty()
+    print("self-check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())